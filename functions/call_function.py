@@ -9,6 +9,25 @@ available_functions = types.Tool(
     function_declarations=[schema_get_files_info, schema_get_file_content, schema_run_python_file, schema_write_file],
 )
 
+# Dispatch table from tool name to implementation, built once at import
+function_map = {
+    "get_files_info": get_files_info,
+    "get_file_content": get_file_content,
+    "run_python_file": run_python_file,
+    "write_file": write_file,
+}
+
+# Argument names each tool declares, so bad calls are rejected up front
+# instead of raising a TypeError inside the tool
+_declared_args = {
+    declaration.name: frozenset(declaration.parameters.properties or {})
+    for declaration in available_functions.function_declarations
+}
+
+# Read-only tools that can safely run alongside each other. Anything that
+# writes files or executes code runs on its own, in the order requested.
+concurrency_safe_functions = frozenset({"get_files_info", "get_file_content"})
+
 
 def call_function(function_call, verbose=False):
     if verbose:
@@ -16,28 +35,19 @@ def call_function(function_call, verbose=False):
     else:
         print(f" - Calling function: {function_call.name}")
         
-    functions = {
-        "get_files_info": get_files_info,
-        "get_file_content": get_file_content,
-        "run_python_file": run_python_file,
-        "write_file": write_file,
-    }
-    
     function_name = function_call.name
-    target_function = functions.get(function_name)
-    kwargs = dict(function_call.args)
-    kwargs["working_directory"] = "./calculator"
+    target_function = function_map.get(function_name)
     
     if not target_function:
-        return types.Content(
-            role="tool",
-            parts=[
-                types.Part.from_function_response(
-                    name=function_name,
-                    response={"error": f"Unknown function: {function_name}"},
-                )
-            ],
+        return _error_response(function_name, f"Unknown function: {function_name}")
+    
+    kwargs = dict(function_call.args or {})
+    unexpected = kwargs.keys() - _declared_args[function_name]
+    if unexpected:
+        return _error_response(
+            function_name, f"Unexpected arguments for {function_name}: {', '.join(sorted(unexpected))}"
         )
+    kwargs["working_directory"] = "./calculator"
     
     function_result = target_function(**kwargs)
     
@@ -49,4 +59,16 @@ def call_function(function_call, verbose=False):
                 response={"result": function_result},
             )
         ],
-    )
\ No newline at end of file
+    )
+
+
+def _error_response(function_name, message):
+    return types.Content(
+        role="tool",
+        parts=[
+            types.Part.from_function_response(
+                name=function_name,
+                response={"error": message},
+            )
+        ],
+    )
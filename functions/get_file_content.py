@@ -1,5 +1,7 @@
 from google.genai import types
+from functions.paths import resolve_working_directory, is_within_directory
 from config import MAX_CHARS
+import codecs
 import os
 
 
@@ -19,10 +21,13 @@ schema_get_file_content = types.FunctionDeclaration(
 )
 
 
+_utf8_decoder = codecs.getincrementaldecoder("utf-8")
+
+
 def get_file_content(working_directory, file_path):
-    working_dir_abs = os.path.abspath(working_directory)
+    working_dir_abs = resolve_working_directory(working_directory)
     target_path = os.path.normpath(os.path.join(working_dir_abs, file_path))
-    is_valid_target_dir = os.path.commonpath([working_dir_abs, target_path]) == working_dir_abs 
+    is_valid_target_dir = is_within_directory(target_path, working_dir_abs)
 
     try:
         if not is_valid_target_dir:
@@ -30,13 +35,25 @@ def get_file_content(working_directory, file_path):
         elif not os.path.isfile(target_path):
             return f'Error: File not found or is not a regular file: "{file_path}"'
 
-        with open(target_path, 'r') as file:
-            content = file.read(MAX_CHARS)
-
-            if file.read(1):
-                content += f'[...File "{file_path}" truncated at {MAX_CHARS} characters]'
-                
-            return content
+        # One raw read big enough for MAX_CHARS + 1 characters of UTF-8 (at
+        # most 4 bytes each), decoded once; one extra character is enough to
+        # detect truncation. final=False lets a multi-byte character cut off
+        # at the end of the buffer be dropped instead of raising.
+        fd = os.open(target_path, os.O_RDONLY)
+        try:
+            data = os.read(fd, (MAX_CHARS + 1) * 4)
+        finally:
+            os.close(fd)
+
+        content = _utf8_decoder().decode(data, final=False)
+        if "\r" in content:
+            # Match text-mode universal newline handling
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+        if len(content) > MAX_CHARS:
+            content = content[:MAX_CHARS] + f'[...File "{file_path}" truncated at {MAX_CHARS} characters]'
+
+        return content
 
     except Exception as e:
         return f"Error: {e}"
\ No newline at end of file
@@ -1,4 +1,5 @@
 from google.genai import types
+from functions.paths import resolve_working_directory, is_within_directory
 import os
 
 
@@ -18,9 +19,9 @@ schema_get_files_info = types.FunctionDeclaration(
 
 
 def get_files_info(working_directory, directory="."):
-    working_dir_abs = os.path.abspath(working_directory)
+    working_dir_abs = resolve_working_directory(working_directory)
     target_dir = os.path.normpath(os.path.join(working_dir_abs, directory))
-    is_valid_target_dir = os.path.commonpath([working_dir_abs, target_dir]) == working_dir_abs 
+    is_valid_target_dir = is_within_directory(target_dir, working_dir_abs)
 
     try:
         if not is_valid_target_dir:
@@ -28,14 +29,16 @@ def get_files_info(working_directory, directory="."):
         elif not os.path.isdir(target_dir):
             return f'Error: "{directory}" is not a directory'
         
-        dir_contents = os.listdir(target_dir)
+        line_format = "- %s: file_size=%d bytes, is_dir=%s"
         contents_list = []
-        for i in dir_contents:
-            full_path = os.path.join(target_dir, i)
-            name = i
-            file_size = os.path.getsize(full_path)
-            is_dir = os.path.isdir(full_path)
-            contents_list.append(str(f"- {name}: file_size={file_size} bytes, is_dir={is_dir}"))
+        append = contents_list.append
+        with os.scandir(target_dir) as entries:
+            for entry in entries:
+                append(line_format % (
+                    entry.name,
+                    entry.stat(follow_symlinks=False).st_size,
+                    entry.is_dir(follow_symlinks=False),
+                ))
     except Exception as e:
         return f"Error: {e}"
 
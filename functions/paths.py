@@ -0,0 +1,16 @@
+from functools import lru_cache
+import os
+
+
+@lru_cache(maxsize=8)
+def resolve_working_directory(working_directory):
+    # The agent's working directory is fixed for a session and the process
+    # never changes its cwd, so the absolute path can be resolved once.
+    return os.path.abspath(working_directory)
+
+
+def is_within_directory(target_path, working_dir_abs):
+    # A plain string prefix test; no path splitting as with os.path.commonpath.
+    # A root directory already ends with a separator, so don't add another.
+    prefix = working_dir_abs if working_dir_abs.endswith(os.sep) else working_dir_abs + os.sep
+    return target_path == working_dir_abs or target_path.startswith(prefix)
@@ -1,6 +1,11 @@
 from google.genai import types
+from functions.paths import resolve_working_directory, is_within_directory
+import atexit
+import json
 import os
 import subprocess
+import sys
+import threading
 
 
 schema_run_python_file = types.FunctionDeclaration(
@@ -27,10 +32,65 @@ schema_run_python_file = types.FunctionDeclaration(
 )
 
 
+# Interpreter startup dominates short script runs, so one interpreter is kept
+# started ahead of time. It blocks on stdin until it receives the script path,
+# arguments and working directory, then runs the script as __main__. Every run
+# still gets its own fresh process, so no module state leaks between runs.
+_BOOTSTRAP = """
+import json, os, runpy, sys
+target, args, cwd = json.loads(sys.stdin.readline())
+os.chdir(cwd)
+sys.argv = [target, *args]
+sys.path[0] = os.path.dirname(target)
+try:
+    runpy.run_path(target, run_name="__main__")
+except Exception:
+    import traceback
+    exc_type, exc, tb = sys.exc_info()
+    while tb is not None and tb.tb_frame.f_code.co_filename != target:
+        tb = tb.tb_next
+    traceback.print_exception(exc_type, exc, tb)
+    sys.exit(1)
+"""
+
+_warm_lock = threading.Lock()
+_warm_process = None
+
+
+def _spawn_interpreter():
+    # Our descriptors are non-inheritable by default (PEP 446), so skipping the
+    # close_fds sweep is safe and keeps the spawn on the fast path.
+    return subprocess.Popen(
+        [sys.executable, "-c", _BOOTSTRAP],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        close_fds=False,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+
+
+def _take_interpreter():
+    global _warm_process
+    with _warm_lock:
+        process = _warm_process
+        if process is None or process.poll() is not None:
+            process = _spawn_interpreter()
+        _warm_process = _spawn_interpreter()
+    return process
+
+
+@atexit.register
+def _discard_warm_interpreter():
+    if _warm_process is not None and _warm_process.poll() is None:
+        _warm_process.kill()
+        _warm_process.wait()
+
+
 def run_python_file(working_directory, file_path, args=None):
-    working_dir_abs = os.path.abspath(working_directory)
+    working_dir_abs = resolve_working_directory(working_directory)
     target_path = os.path.normpath(os.path.join(working_dir_abs, file_path))
-    is_valid_target_dir = os.path.commonpath([working_dir_abs, target_path]) == working_dir_abs 
+    is_valid_target_dir = is_within_directory(target_path, working_dir_abs)
     
     try:
         if not is_valid_target_dir:
@@ -40,12 +100,26 @@ def run_python_file(working_directory, file_path, args=None):
         elif not file_path.endswith(".py"):
             return f'Error: "{file_path}" is not a Python file'
         
-        command = ["python", target_path]
+        command = [sys.executable, target_path]
         
         if args:
             command.extend(args)
             
-        run_process = subprocess.run(command, cwd=working_dir_abs, capture_output=True, text=True, timeout=30)
+        process = _take_interpreter()
+        request = json.dumps([target_path, command[2:], working_dir_abs]) + "\n"
+        try:
+            stdout, stderr = process.communicate(request.encode(), timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise subprocess.TimeoutExpired(command, 30)
+        # Output is collected as raw bytes and decoded once per stream
+        run_process = subprocess.CompletedProcess(
+            command,
+            process.returncode,
+            stdout.decode("utf-8", "replace"),
+            stderr.decode("utf-8", "replace"),
+        )
         run_process_output = ""
         
         if run_process.returncode != 0:
@@ -1,5 +1,5 @@
-from genericpath import isdir
 from google.genai import types
+from functions.paths import resolve_working_directory, is_within_directory
 import os
 
 
@@ -23,10 +23,14 @@ schema_write_file = types.FunctionDeclaration(
 )
 
 
+# Parent directories already created (or known to exist) this session
+_seen_dirs = set()
+
+
 def write_file(working_directory, file_path, content):
-    working_dir_abs = os.path.abspath(working_directory)
+    working_dir_abs = resolve_working_directory(working_directory)
     target_path = os.path.normpath(os.path.join(working_dir_abs, file_path))
-    is_valid_target_dir = os.path.commonpath([working_dir_abs, target_path]) == working_dir_abs 
+    is_valid_target_dir = is_within_directory(target_path, working_dir_abs)
     
     try:
         if not is_valid_target_dir:
@@ -34,12 +38,26 @@ def write_file(working_directory, file_path, content):
         elif os.path.isdir(target_path):
             return f'Error: Cannot write to "{file_path}" as it is a directory'
         
-        os.makedirs(os.path.dirname(target_path), exist_ok=True)  
+        parent_dir = os.path.dirname(target_path)
+        if parent_dir != working_dir_abs and parent_dir not in _seen_dirs:
+            os.makedirs(parent_dir, exist_ok=True)
+            _seen_dirs.add(parent_dir)
+        
+        # Encode once and write in binary mode; a payload larger than the
+        # buffer goes straight to the kernel instead of through TextIOWrapper
+        data = content.encode("utf-8")
+        try:
+            file = open(target_path, "wb")
+        except FileNotFoundError:
+            # The directory was never created or has been removed since
+            _seen_dirs.discard(parent_dir)
+            os.makedirs(parent_dir, exist_ok=True)
+            file = open(target_path, "wb")
         
-        with open(target_path, "w") as file:
-            file.write(content)
+        with file:
+            file.write(data)
             
-            return f'Successfully wrote to "{file_path}" ({len(content)} characters written)'
+        return f'Successfully wrote to "{file_path}" ({len(content)} characters written)'
         
     except Exception as e:
         return f"Error: {e}"
\ No newline at end of file
@@ -1,22 +1,49 @@
-from dotenv import load_dotenv
-from google import genai
-from google.genai import types
+from __future__ import annotations
+
 from prompts import SYSTEM_PROMPT
-from functions.call_function import available_functions, call_function
+from config import MAX_CHARS
 from memory.manager import MemoryManager
-from typing import Optional
+from memory.response_cache import ResponseCache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from typing import TYPE_CHECKING, Iterator, Optional
 import argparse
+import logging
+import queue
+import random
+import time
 import sys
 import os
 
+# The Gemini SDK (and the tool schemas built on it) is slow to import, so it
+# is imported inside the functions that use it, after argument parsing;
+# --help stays instant. Annotations only need the names for type checkers.
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
 
-load_dotenv()
 
-api_key = os.environ.get("GEMINI_API_KEY")
-if not api_key:
-    raise RuntimeError("Failed to load API key.")
+def load_client() -> genai.Client:
+    """Import the Gemini SDK and create the API client."""
+    from dotenv import load_dotenv
+    from google import genai
+    
+    load_dotenv()
+    
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("Failed to load API key.")
+    
+    return genai.Client(api_key=api_key)
 
-client = genai.Client(api_key=api_key)
+
+MODEL_NAME = 'gemini-2.5-flash'
+
+# Transient API failures (rate limits, server errors) are retried with backoff
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+MAX_API_ATTEMPTS = 5
+MAX_BACKOFF_SECONDS = 30
 
 
 # === UI / Formatting ===
@@ -31,8 +58,37 @@ class Colors:
     BOLD = '\033[1m'
     DIM = '\033[2m'
 
-def print_tool_log(message: str):
-    print(f"{Colors.YELLOW}{Colors.DIM}  → {message}{Colors.ENDC}")
+# Debug output (--verbose) goes through this logger; messages use lazy
+# %-formatting so nothing is built unless verbose logging is enabled
+logger = logging.getLogger("optimus")
+
+
+def setup_logging(verbose: bool) -> Optional[QueueListener]:
+    """
+    Configure the agent logger for the session.
+    
+    When verbose, records are handed to a queue and written by a listener
+    thread, so tool worker threads never block on terminal I/O.
+    
+    Returns:
+        The running listener (stop it on exit), or None when not verbose.
+    """
+    logger.propagate = False
+    if not verbose:
+        logger.setLevel(logging.WARNING)
+        logger.addHandler(logging.StreamHandler())
+        return None
+    
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(f"{Colors.YELLOW}{Colors.DIM}  → %(message)s{Colors.ENDC}"))
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.DEBUG)
+    listener.start()
+    return listener
+
 
 def print_ai(message: str):
     print(f"\n{Colors.BLUE}Optimus:{Colors.ENDC} {message}")
@@ -41,6 +97,112 @@ def print_user(message: str):
     print(f"\n{Colors.GREEN}You:{Colors.ENDC} {message}") 
 
 
+# === Conversation History ===
+# Older exchanges are dropped once the previous prompt exceeded either limit
+MAX_PROMPT_TOKENS = 100_000
+MAX_HISTORY_MESSAGES = 200
+
+class History:
+    """
+    The message list sent to the model, plus per-role index lookups.
+    
+    Positions of user and model turns are tracked as messages are appended,
+    so finding the latest turn of a role doesn't require scanning the history.
+    """
+    def __init__(self):
+        self.messages: list[types.Content] = []
+        self._indices: dict[str, deque[int]] = {}
+    
+    def __len__(self) -> int:
+        return len(self.messages)
+    
+    def __getitem__(self, index: int) -> types.Content:
+        return self.messages[index]
+    
+    def append(self, content: types.Content) -> None:
+        self.messages.append(content)
+        self._indices.setdefault(content.role, deque()).append(len(self.messages) - 1)
+    
+    def last_index(self, role: str) -> int:
+        """Index of the most recent message with this role, or -1 if none."""
+        indices = self._indices.get(role)
+        return indices[-1] if indices else -1
+    
+    def last_model_text(self) -> str:
+        """Text of the most recent model message, or "" if there is none."""
+        index = self.last_index("model")
+        if index == -1 or not self.messages[index].parts:
+            return ""
+        return self.messages[index].parts[0].text or ""
+    
+    def pop(self, index: int) -> types.Content:
+        """Remove a message, re-indexing the remaining ones (rare path)."""
+        content = self.messages.pop(index)
+        self._reindex()
+        return content
+    
+    def trim_to_budget(
+        self,
+        prompt_tokens: int,
+        max_tokens: int = MAX_PROMPT_TOKENS,
+        max_messages: int = MAX_HISTORY_MESSAGES
+    ) -> int:
+        """
+        Drop the oldest exchanges once the history outgrows its budget.
+        
+        The prompt token count of the previous request is spread across the
+        messages by size to estimate how much to drop. Cuts only happen just
+        before a user text turn, so a function call is never separated from
+        its response, and the latest user turn is always kept.
+        
+        Returns:
+            The number of messages removed.
+        """
+        if prompt_tokens <= max_tokens and len(self.messages) <= max_messages:
+            return 0
+        
+        sizes = [_content_size(m) for m in self.messages]
+        tokens_per_char = prompt_tokens / (sum(sizes) or 1)
+        excess_tokens = prompt_tokens - max_tokens
+        excess_messages = len(self.messages) - max_messages
+        
+        cut = 0
+        dropped_tokens = 0.0
+        for i in range(1, len(self.messages)):
+            dropped_tokens += sizes[i - 1] * tokens_per_char
+            if _is_user_text(self.messages[i]):
+                cut = i
+                if dropped_tokens >= excess_tokens and i >= excess_messages:
+                    break
+        
+        if cut:
+            del self.messages[:cut]
+            self._reindex()
+        return cut
+    
+    def _reindex(self) -> None:
+        self._indices = {}
+        for i, m in enumerate(self.messages):
+            self._indices.setdefault(m.role, deque()).append(i)
+
+
+def _is_user_text(content: types.Content) -> bool:
+    return content.role == "user" and bool(content.parts) and content.parts[0].text is not None
+
+
+def _content_size(content: types.Content) -> int:
+    """Rough size of a message in characters, used to apportion tokens."""
+    size = 0
+    for part in content.parts or []:
+        if part.text is not None:
+            size += len(part.text)
+        elif part.function_call is not None:
+            size += len(str(part.function_call.args))
+        elif part.function_response is not None:
+            size += len(str(part.function_response.response))
+    return size
+
+
 # === Main Logic ===
 
 def main() -> None:
@@ -53,10 +215,24 @@ def main() -> None:
     cli_parser = argparse.ArgumentParser(description="Chatbot")
     cli_parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
     args = cli_parser.parse_args()
+    
+    log_listener = setup_logging(args.verbose)
+    client = load_client()
+    from google.genai import types
+    from functions.call_function import available_functions
 
     mem_manager = MemoryManager.initialize()
     
-    messages = []
+    history = History()
+    
+    config = types.GenerateContentConfig(tools=[available_functions])
+    current_context = None
+    last_prompt_tokens = 0
+    # Saved next to the memory database so repeated CLI queries can hit
+    response_cache = ResponseCache(
+        ttl=mem_manager.config.retention.conversation_ttl,
+        path=os.path.join(os.path.dirname(os.path.abspath(mem_manager.config.storage_path)), "response_cache.json"),
+    )
     
     print(f"{Colors.BOLD}Optimus AI is ready.{Colors.ENDC} Type 'exit' to quit, or 'correction' to fix.")
     
@@ -72,14 +248,8 @@ def main() -> None:
             
             # Correction Logic
             if user_input.lower() == 'correction':
-                last_ai_content = None
-                last_ai_index = -1
-                
-                for i, m in enumerate(reversed(messages)):
-                    if m.role == "model":
-                        last_ai_content = m.parts[0].text
-                        last_ai_index = len(messages) - 1 - i
-                        break
+                last_ai_index = history.last_index("model")
+                last_ai_content = history[last_ai_index].parts[0].text if last_ai_index != -1 else None
                 
                 if not last_ai_content:
                     print(f"{Colors.RED}>> No previous AI response to correct.{Colors.ENDC}")
@@ -97,60 +267,86 @@ def main() -> None:
                 # This ensures future sessions won't remember it
                 mem_manager.soft_delete_last_conversation()
                 
+                # Don't replay answers that may share the corrected mistake
+                response_cache.clear()
+                
                 # Hard delete the bad memory from the active session
                 # This ensures the next prompt won't see it
                 if last_ai_index != -1:
-                    messages.pop(last_ai_index)
+                    history.pop(last_ai_index)
                     
                     # Try to remove the user message that triggered the correction
-                    if last_ai_index > 0 and messages[last_ai_index - 1].role == "user":
-                        messages.pop(last_ai_index - 1)
+                    if last_ai_index > 0 and history[last_ai_index - 1].role == "user":
+                        history.pop(last_ai_index - 1)
                 
                 print(f"{Colors.DIM}>> Correction stored.{Colors.ENDC}")
                 continue 
 
             #print() # Visual Separator
 
-            messages.append(types.Content(role="user", parts=[types.Part(text=user_input)]))
+            # Answers are only reused after the same previous answer (none
+            # for an opening question), so a follow-up like "why?" is only
+            # replayed where it means the same thing
+            previous_answer = history.last_model_text()
+            history.append(types.Content(role="user", parts=[types.Part(text=user_input)]))
+            
+            # Repeated question: answer from the cache without calling the model
+            cached_text = response_cache.get(user_input, context=previous_answer)
+            if cached_text is not None:
+                print(f"\n{Colors.BLUE}Optimus:{Colors.ENDC} {cached_text}")
+                history.append(types.Content(role="model", parts=[types.Part(text=cached_text)]))
+                # The turn still happened, so memory records it as usual
+                mem_manager.store_conversation(
+                    user_message=user_input,
+                    assistant_response=cached_text,
+                    tags=["chat"]
+                )
+                continue
             
             # === INNER LOOP ===
             agent_turn_finished = False
+            used_tools = False
             for _ in range(20):
-                # Build Context
+                # Build Context (the tool schemas are constant; only the
+                # system instruction changes, and only when memory does)
                 context = mem_manager.build_context_string(max_chars=30000)
-                full_system_instructions = f"{SYSTEM_PROMPT}\n\n{context}"
-                config = types.GenerateContentConfig(
-                    tools=[available_functions], 
-                    system_instruction=full_system_instructions
-                )
+                if context != current_context:
+                    current_context = context
+                    config.system_instruction = f"{SYSTEM_PROMPT}\n\n{context}"
+                
+                # Keep the request payload bounded as the session grows
+                history.trim_to_budget(last_prompt_tokens)
                 
                 # Generate Response
                 response = generate_content(
                     client, 
-                    messages, 
+                    history, 
                     config, 
-                    args.verbose, 
                     user_prompt=user_input, 
                     mem_manager=mem_manager
                 )
                 
+                if response.usage_metadata and response.usage_metadata.prompt_token_count:
+                    last_prompt_tokens = response.usage_metadata.prompt_token_count
+                
                 finished = is_model_finished(response)
+                used_tools = used_tools or bool(response.function_calls)
                 
                 if finished:
                     # Capture the final answer
+                    # The answer was already printed as it streamed in
                     ai_text = response.text or "No response text."
-                    print(f"\n{Colors.BLUE}Optimus:{Colors.ENDC} {ai_text}")
                     
                     # --- MEMORY STORAGE (Chat) ---
                     last_user_text = "Unknown"
-                    for m in reversed(messages[:-1]):
-                        if m.role == "user":
-                            # Check if it was a tool output or text
-                            if m.parts and m.parts[0].function_response:
-                                last_user_text = f"Tool Output: {m.parts[0].function_response}"
-                            elif m.parts:
-                                last_user_text = m.parts[0].text
-                            break
+                    user_index = history.last_index("user")
+                    if user_index != -1:
+                        m = history[user_index]
+                        # Check if it was a tool output or text
+                        if m.parts and m.parts[0].function_response:
+                            last_user_text = f"Tool Output: {m.parts[0].function_response}"
+                        elif m.parts:
+                            last_user_text = m.parts[0].text
                         
                     # Store as CHAT
                     mem_manager.store_conversation(
@@ -159,6 +355,11 @@ def main() -> None:
                         tags=["chat"]
                     )
                     
+                    # Answers built from tool output depend on the files at
+                    # the time, so only plain answers are reused
+                    if not used_tools:
+                        response_cache.put(user_input, ai_text, context=previous_answer)
+                    
                     agent_turn_finished = True
                     break
                 
@@ -171,6 +372,10 @@ def main() -> None:
             break                
         except Exception as e:
             print(f"{Colors.RED}Error: {e}{Colors.ENDC}")
+    
+    mem_manager.close()
+    if log_listener:
+        log_listener.stop()
             
             
 def is_model_finished(response: types.GenerateContentResponse) -> bool:
@@ -184,19 +389,157 @@ def is_model_finished(response: types.GenerateContentResponse) -> bool:
         True if the model produced a text response (finished).
         False if the model requested a function call (not finished).
     """
-    for candidate in response.candidates:
-        for part in candidate.content.parts:
-            if hasattr(part, "function_call") and part.function_call is not None:
-                return False
-            
-    return bool(response.text)
+    # function_calls already collects every call part across candidates
+    return not response.function_calls and bool(response.text)
             
 
+def run_function_calls(function_calls: list[types.FunctionCall]) -> list[types.Content]:
+    """
+    Execute the model's tool calls, returning results in request order.
+    
+    Runs of consecutive read-only calls are I/O bound and independent, so they
+    execute concurrently. Calls that write or execute code act as barriers and
+    run alone, so they never race with the reads around them.
+    """
+    from functions.call_function import call_function, concurrency_safe_functions
+    
+    results = []
+    pending_reads = []
+    
+    def flush_reads(pool: ThreadPoolExecutor) -> None:
+        # Call function with verbose=False to suppress its internal print
+        results.extend(pool.map(lambda fc: call_function(fc, verbose=False), pending_reads))
+        pending_reads.clear()
+    
+    with ThreadPoolExecutor(max_workers=min(8, len(function_calls))) as pool:
+        for function_call in function_calls:
+            if function_call.name in concurrency_safe_functions:
+                pending_reads.append(function_call)
+                continue
+            flush_reads(pool)
+            results.append(call_function(function_call, verbose=False))
+        flush_reads(pool)
+    
+    return results
+
+
+def _truncate_tool_result(part: types.Part) -> types.Part:
+    """
+    Cap a tool result at MAX_CHARS before it enters the history.
+    
+    Every later request resends the whole history, so one huge result
+    (e.g. a chatty script's output) would be paid for on each iteration.
+    """
+    from google.genai import types
+    
+    response = part.function_response
+    if response is None or not response.response:
+        return part
+    
+    result = response.response.get("result")
+    if not isinstance(result, str) or len(result) <= MAX_CHARS:
+        return part
+    
+    return types.Part.from_function_response(
+        name=response.name,
+        response={"result": result[:MAX_CHARS] + f"[...Output truncated at {MAX_CHARS} characters]"},
+    )
+
+
+def _stream_with_retry(
+    client: genai.Client,
+    history: History,
+    config: types.GenerateContentConfig
+) -> Iterator[types.GenerateContentResponse]:
+    """
+    Yield response chunks, retrying transient API errors with backoff.
+    
+    Rate limits and server errors are retried with exponential backoff
+    (plus jitter) instead of failing the turn. Once a chunk has been
+    yielded the partial answer is already consumed, so later errors are
+    raised rather than retried.
+    """
+    from google.genai import errors
+    
+    for attempt in range(MAX_API_ATTEMPTS):
+        started = False
+        try:
+            for chunk in client.models.generate_content_stream(
+                model=MODEL_NAME, 
+                contents=history.messages,
+                config=config,
+            ):
+                started = True
+                yield chunk
+            return
+        except errors.APIError as e:
+            if started or e.code not in RETRYABLE_STATUS_CODES or attempt == MAX_API_ATTEMPTS - 1:
+                raise
+            time.sleep(min(MAX_BACKOFF_SECONDS, 2 ** attempt) + random.random())
+
+
+def stream_content(
+    client: genai.Client,
+    history: History,
+    config: types.GenerateContentConfig
+) -> types.GenerateContentResponse:
+    """
+    Stream a model response, printing its text as it arrives.
+    
+    The chunks are merged back into a single response (text fragments
+    joined, other parts kept in order) so callers can treat it like the
+    result of a non-streaming call.
+    
+    Returns:
+        The assembled response.
+    """
+    from google.genai import types
+    
+    parts: list[types.Part] = []
+    finish_reason = None
+    usage_metadata = None
+    printed_header = False
+    
+    for chunk in _stream_with_retry(client, history, config):
+        # The final chunk carries the totals for the whole response
+        if chunk.usage_metadata:
+            usage_metadata = chunk.usage_metadata
+        if not chunk.candidates:
+            continue
+        
+        candidate = chunk.candidates[0]
+        finish_reason = candidate.finish_reason or finish_reason
+        if not candidate.content or not candidate.content.parts:
+            continue
+        
+        for part in candidate.content.parts:
+            if part.text is not None and not part.thought:
+                if not printed_header:
+                    print(f"\n{Colors.BLUE}Optimus:{Colors.ENDC} ", end="")
+                    printed_header = True
+                print(part.text, end="", flush=True)
+                
+                if parts and parts[-1].text is not None and not parts[-1].thought:
+                    parts[-1] = types.Part(text=parts[-1].text + part.text)
+                    continue
+            parts.append(part)
+    
+    if printed_header:
+        print()
+    
+    return types.GenerateContentResponse(
+        candidates=[types.Candidate(
+            content=types.Content(role="model", parts=parts),
+            finish_reason=finish_reason,
+        )] if parts else [],
+        usage_metadata=usage_metadata,
+    )
+
+
 def generate_content(
     client: genai.Client, 
-    messages: list[types.Content], 
+    history: History, 
     config: types.GenerateContentConfig, 
-    verbose: bool, 
     user_prompt: str,
     mem_manager: Optional[MemoryManager] = None
 ) -> types.GenerateContentResponse:
@@ -204,13 +547,12 @@ def generate_content(
     Send the conversation history to the model and handle the response.
 
     This function handles the API call, validation of the response, logging
-    token usage (if verbose), and executing any requested tool calls.
+    token usage (at debug level), and executing any requested tool calls.
 
     Args:
         client: The initialized Gemini API client.
-        messages: The history of messages in the conversation.
+        history: The history of messages in the conversation.
         config: Configuration containing tools and system instructions.
-        verbose: Whether to print debug information.
         user_prompt: The original user prompt (for logging purposes).
 
     Returns:
@@ -220,31 +562,36 @@ def generate_content(
         RuntimeError: If API response is missing critical metadata.
         Exception: If tool execution fails.
     """
-    response = client.models.generate_content(
-        model='gemini-2.5-flash', 
-        contents=messages,
-        config=config,
-    )
+    from google.genai import types
+    
+    response = stream_content(client, history, config)
     
-    # Verbose logging for tokens
-    if verbose and response.usage_metadata:
-        print(f"{Colors.DIM}[Tokens: Prompt={response.usage_metadata.prompt_token_count}, Resp={response.usage_metadata.candidates_token_count}]{Colors.ENDC}")
+    # Debug logging for tokens
+    if response.usage_metadata:
+        logger.debug(
+            "[Tokens: Prompt=%s, Resp=%s]",
+            response.usage_metadata.prompt_token_count,
+            response.usage_metadata.candidates_token_count,
+        )
     
     function_call_parts = []
+    pending_patterns = []
     
     # Handle Tool Execution
     if response.function_calls:
-        for function_call in response.function_calls:
+        function_calls = response.function_calls
+        
+        # --- CUSTOM UI LOGGING ---
+        if logger.isEnabledFor(logging.DEBUG):
+            for function_call in function_calls:
+                logger.debug("Running: %s(%s)", function_call.name or "", function_call.args)
+        
+        results = run_function_calls(function_calls)
+        
+        for function_call, function_call_result in zip(function_calls, results):
 
             cmd_name = function_call.name or ""
             cmd_args = function_call.args
-            
-            # --- CUSTOM UI LOGGING ---
-            if verbose:
-                print_tool_log(f"Running: {cmd_name}({cmd_args})")
-            
-            # Call function with verbose=False to suppress its internal print
-            function_call_result = call_function(function_call, verbose=False)
 
             if not function_call_result.parts:
                 raise Exception("Function call did not return any parts")
@@ -252,27 +599,27 @@ def generate_content(
             part = function_call_result.parts[0]
             
             # Memory pattern logic
-            if mem_manager and hasattr(part, "function_response"):
+            if mem_manager and part.function_response is not None:
                 response_dict = part.function_response.response
                 is_success = "error" not in response_dict
                 
                 pattern_str = f"{cmd_name}({cmd_args})"
-                mem_manager.store_tool_pattern(
-                    tool_name=cmd_name,
-                    pattern=pattern_str,
-                    success=is_success,
-                    importance=0.5 if is_success else 0.1
+                pending_patterns.append(
+                    (cmd_name, pattern_str, is_success, 0.5 if is_success else 0.1)
                 )
-                if verbose:
-                    print_tool_log(f"Learned pattern: {pattern_str}")
+                logger.debug("Learned pattern: %s", pattern_str)
 
-            function_call_parts.append(part)
+            function_call_parts.append(_truncate_tool_result(part))
+    
+    # Persist all learned patterns in a single transaction
+    if mem_manager and pending_patterns:
+        mem_manager.store_tool_patterns_bulk(pending_patterns)
     
     # Append Assistant Responses to History
     if response.candidates:
         for ai_response in response.candidates:
             if ai_response.content:
-                messages.append(ai_response.content)
+                history.append(ai_response.content)
     
     # Append Tool Results to History (if any)
     if function_call_parts:
@@ -280,7 +627,7 @@ def generate_content(
             role="user",
             parts=function_call_parts,
         )
-        messages.append(tool_response_message)
+        history.append(tool_response_message)
         
     return response
 
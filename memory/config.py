@@ -15,12 +15,18 @@ Review carefully before changing defaults.
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional, TypeVar
 from datetime import timedelta
 import os
+import re
+import sys
 from pathlib import Path
 
 
+E = TypeVar("E", bound=Enum)
+
+
 class MemoryScope(Enum):
     """
     Defines the visibility/scope of a memory.
@@ -64,13 +70,50 @@ class MemoryType(Enum):
     TOOL_PATTERN = "tool_pattern"        # Successful tool usage patterns
 
 
-@dataclass
+# TTL for memory types without a dedicated setting
+_DEFAULT_TTL = timedelta(days=7)
+
+# RetentionSettings field holding each memory type's TTL
+_TTL_ATTR_BY_TYPE: dict[MemoryType, str] = {
+    MemoryType.CONVERSATION: "conversation_ttl",
+    MemoryType.USER_PREFERENCE: "user_preference_ttl",
+    MemoryType.PROJECT_CONTEXT: "project_context_ttl",
+    MemoryType.TASK_RESULT: "task_result_ttl",
+    MemoryType.LEARNED_CORRECTION: "correction_ttl",
+    MemoryType.TOOL_PATTERN: "tool_pattern_ttl",
+}
+
+
+def parse_enum(enum_cls: type[E], value: Any) -> E:
+    """
+    Convert a stored value back to its enum member.
+    
+    Looks the value up in the enum's value map directly, skipping the
+    EnumMeta.__call__ machinery; unknown values still raise ValueError.
+    """
+    member = enum_cls._value2member_map_.get(value)
+    if member is None:
+        return enum_cls(value)
+    return member
+
+
+# Value -> member maps for the enums decoded on every loaded memory. Hot
+# paths index these inline (falling back to parse_enum for unknown values)
+# to skip even parse_enum's call overhead.
+MEMORY_SCOPE_BY_VALUE: dict[str, MemoryScope] = {m.value: m for m in MemoryScope}
+MEMORY_TYPE_BY_VALUE: dict[str, MemoryType] = {m.value: m for m in MemoryType}
+RETENTION_POLICY_BY_VALUE: dict[str, RetentionPolicy] = {m.value: m for m in RetentionPolicy}
+
+
+@dataclass(slots=True, frozen=True)
 class RetentionSettings:
     """
     Time-to-live settings for each memory type.
     
     These can be adjusted based on your storage constraints and
     how long you want the agent to remember different things.
+    Settings are immutable once created (use dataclasses.replace to
+    change one), so the per-type TTL table is computed only once.
     """
     conversation_ttl: timedelta = field(default_factory=lambda: timedelta(days=7))
     user_preference_ttl: timedelta = field(default_factory=lambda: timedelta(days=90))
@@ -79,20 +122,23 @@ class RetentionSettings:
     correction_ttl: timedelta = field(default_factory=lambda: timedelta(days=180))
     tool_pattern_ttl: timedelta = field(default_factory=lambda: timedelta(days=60))
     
+    _ttl_by_type: dict[MemoryType, timedelta] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+    
+    def __post_init__(self):
+        # Frozen, so the table is filled via object.__setattr__
+        object.__setattr__(self, "_ttl_by_type", {
+            memory_type: getattr(self, attr)
+            for memory_type, attr in _TTL_ATTR_BY_TYPE.items()
+        })
+    
     def get_ttl(self, memory_type: MemoryType) -> timedelta:
         """Get the TTL for a specific memory type."""
-        mapping = {
-            MemoryType.CONVERSATION: self.conversation_ttl,
-            MemoryType.USER_PREFERENCE: self.user_preference_ttl,
-            MemoryType.PROJECT_CONTEXT: self.project_context_ttl,
-            MemoryType.TASK_RESULT: self.task_result_ttl,
-            MemoryType.LEARNED_CORRECTION: self.correction_ttl,
-            MemoryType.TOOL_PATTERN: self.tool_pattern_ttl,
-        }
-        return mapping.get(memory_type, timedelta(days=7))
+        return self._ttl_by_type.get(memory_type, _DEFAULT_TTL)
 
 
-@dataclass
+@dataclass(slots=True)
 class StorageLimits:
     """
     Limits to prevent unbounded memory growth.
@@ -117,9 +163,108 @@ class StorageLimits:
     # Context building limits (for prompt injection)
     max_memories_in_context: int = 20    # Max memories to include in prompt
     max_context_chars: int = 8000        # Max total chars for memory context
+    # build_context_string() results are reused for this long (unless this
+    # manager writes first); bounds staleness from other writers to the DB
+    context_cache_ttl_seconds: float = 30.0
+    
+    # Write-behind buffering for MemoryManager writes. Memories are held
+    # until this many are pending or the interval has passed, then written
+    # in one transaction. 1 writes every memory immediately.
+    write_batch_size: int = 1
+    write_flush_interval_ms: float = 250.0
+
 
+@lru_cache(maxsize=8)
+def compile_sensitive_patterns(patterns: tuple[str, ...]) -> tuple[re.Pattern, ...]:
+    """
+    Compile sensitive-data patterns once, in order.
+    
+    The patterns are meant to be applied one after another. Fusing them
+    into one leftmost-first alternation is not equivalent: one pattern's
+    match can swallow the start of another's (a connection string eating
+    "Password="), leaving the rest of that secret unredacted.
+    
+    Cached by pattern tuple, so configs sharing the default list share the
+    compiled objects. Invalid patterns are skipped with a warning.
+    
+    Returns:
+        The compiled patterns (empty if none are valid).
+    """
+    compiled = []
+    for pattern in patterns:
+        try:
+            compiled.append(re.compile(pattern, re.IGNORECASE | re.MULTILINE))
+        except re.error as e:
+            # Log but don't crash - one bad pattern shouldn't break everything
+            print(f"WARNING: Invalid sensitive pattern '{pattern}': {e}")
+    return tuple(compiled)
+
+
+# Backreferences and conditionals address groups by number, which shifts
+# once patterns are joined into one alternation
+_GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+@lru_cache(maxsize=8)
+def sensitive_prescreen(patterns: tuple[str, ...]) -> Optional[re.Pattern]:
+    """
+    One alternation of all sensitive patterns, used only to search.
+    
+    search() on the alternation finds a match wherever any single pattern
+    would, with the same IGNORECASE semantics, so content it misses can skip
+    the per-pattern redaction passes. It is never used to replace: see
+    compile_sensitive_patterns for why a fused sub() leaks.
+    
+    Returns:
+        The compiled alternation, or None if the patterns can't be fused
+        safely (then every content must be scanned pattern by pattern).
+    """
+    branches = []
+    for pattern in patterns:
+        # IGNORECASE applies to the whole alternation, and global inline
+        # flags are only legal at the very start of a pattern
+        if pattern.startswith("(?i)"):
+            pattern = pattern[4:]
+        if _GROUP_REFERENCE.search(pattern):
+            return None
+        try:
+            re.compile(pattern)
+        except re.error:
+            # compile_sensitive_patterns warns about and skips these
+            continue
+        branches.append(f"(?:{pattern})")
+    
+    if not branches:
+        return None
+    try:
+        return re.compile("|".join(branches), re.IGNORECASE | re.MULTILINE)
+    except re.error:
+        # e.g. the same named group in two patterns
+        return None
+
+
+@lru_cache(maxsize=8)
+def compile_blocked_sequences(sequences: tuple[str, ...]) -> Optional[re.Pattern]:
+    """
+    Build one regex matching any blocked literal, raw or already escaped.
+    
+    Alternatives are longest-first so a sequence is never shadowed by one
+    of its prefixes. An escaped occurrence ("[SYSTEM:]") is matched as a
+    whole, so callers can leave it alone instead of escaping it twice;
+    raw occurrences are captured in the "raw" group.
+    
+    Returns:
+        The compiled pattern, or None if there are no sequences.
+    """
+    literals = sorted({s for s in sequences if s}, key=len, reverse=True)
+    if not literals:
+        return None
+    
+    alternation = "|".join(re.escape(s) for s in literals)
+    return re.compile(rf"\[(?:{alternation})\]|(?P<raw>{alternation})")
 
-@dataclass
+
+@dataclass(slots=True)
 class SafetySettings:
     """
     Security-related configuration.
@@ -166,9 +311,99 @@ class SafetySettings:
     
     # Require user confirmation for high-impact operations
     require_confirmation_for_clear: bool = True
+    
+    @property
+    def sensitive_regexes(self) -> tuple[re.Pattern, ...]:
+        """The sensitive patterns, compiled (and shared between configs)."""
+        return compile_sensitive_patterns(tuple(self.sensitive_patterns))
+    
+    @property
+    def sensitive_prescreen(self) -> Optional[re.Pattern]:
+        """Search-only union of the sensitive patterns (None if unavailable)."""
+        return sensitive_prescreen(tuple(self.sensitive_patterns))
+    
+    def scan(self, text: str) -> list[re.Match]:
+        """Find every match of every sensitive pattern in text."""
+        return [match for regex in self.sensitive_regexes for match in regex.finditer(text)]
+    
+    @property
+    def blocked_regex(self) -> Optional[re.Pattern]:
+        """All blocked sequences as one compiled regex (None if empty)."""
+        return compile_blocked_sequences(tuple(self.blocked_sequences))
+    
+    def contains_blocked(self, text: str) -> bool:
+        """Whether text contains any blocked sequence, escaped or not."""
+        regex = self.blocked_regex
+        return regex is not None and regex.search(text) is not None
+
+
+# Accepted values for the SQLite PRAGMA settings on MemoryConfig
+SQLITE_JOURNAL_MODES = frozenset({"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"})
+SQLITE_SYNCHRONOUS_MODES = frozenset({"OFF", "NORMAL", "FULL", "EXTRA"})
+
+
+# Directories already created (or found) by this process; mkdir is skipped
+# for these so building a config doesn't cost a syscall every time.
+_KNOWN_DIRS: set[Path] = set()
+
+
+def _ensure_dir(directory: Path) -> None:
+    """Create a directory (and parents) once per process."""
+    if directory not in _KNOWN_DIRS:
+        directory.mkdir(parents=True, exist_ok=True)
+        _KNOWN_DIRS.add(directory)
+
+
+def _platform_base_dir() -> Optional[Path]:
+    """Platform-appropriate per-user data directory, or None if unknown."""
+    try:
+        if sys.platform == "win32":
+            return Path(os.environ.get('APPDATA') or Path.home() / 'AppData' / 'Roaming')
+        return Path.home()  # Linux/Mac
+    except (RuntimeError, OSError):
+        # Path.home() raises RuntimeError when no home directory can be found
+        return None
+
+
+# Resolved once at import; like other per-process settings, later changes
+# to APPDATA/HOME are not picked up
+_PLATFORM_BASE_DIR = _platform_base_dir()
+
+
+@lru_cache(maxsize=4)
+def _resolve_default_db_path(override_path: Optional[str]) -> str:
+    """
+    Resolve the default database path (see MemoryConfig._get_default_db_path).
+    
+    Cached per environment override, so the path is worked out and its
+    directory created only once per process.
+    """
+    # Check for environment variable override first
+    if override_path:
+        return str(Path(override_path).expanduser().resolve())
+    
+    try:
+        if _PLATFORM_BASE_DIR is None:
+            raise OSError("could not determine the user data directory")
+        
+        # Create the optimus_ai subdirectory path
+        app_data_dir = _PLATFORM_BASE_DIR / '.optimus_ai'
+        db_path = app_data_dir / 'memory.db'
+        
+        # Ensure directory exists
+        _ensure_dir(app_data_dir)
+        
+        return str(db_path)
+        
+    except (PermissionError, OSError) as e:
+        # Fallback to project directory if user directory fails
+        print(f"Warning: Could not access user directory ({e}), falling back to project directory")
+        fallback_dir = Path.cwd() / 'data'
+        _ensure_dir(fallback_dir)
+        return str(fallback_dir / 'memory.db')
 
 
-@dataclass  
+@dataclass(slots=True)
 class MemoryConfig:
     """
     Main configuration container with smart database path resolution.
@@ -201,6 +436,19 @@ class MemoryConfig:
     limits: StorageLimits = field(default_factory=StorageLimits)
     safety: SafetySettings = field(default_factory=SafetySettings)
     
+    # SQLite connection tuning (applied as PRAGMAs when the store connects)
+    # WAL lets reads proceed while a write is in progress; NORMAL sync is
+    # safe under WAL and avoids an fsync per transaction. WAL keeps -wal and
+    # -shm files beside the database, so its directory must be writable; use
+    # "DELETE" for a database on read-only or network storage.
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kb: int = 65536  # 64MB
+    sqlite_mmap_size: int = 268435456  # 256MB
+    sqlite_wal_autocheckpoint: int = 1000  # Pages of WAL before a checkpoint
+    sqlite_pool_size: int = 5  # Read connections kept alongside the one writer
+    
     # Feature flags
     enable_semantic_search: bool = False  # Future: requires vector DB
     enable_auto_summarization: bool = False  # Future: summarize old convos
@@ -211,8 +459,7 @@ class MemoryConfig:
             self.storage_path = self._get_default_db_path()
         else:
             # Ensure directory exists for explicit paths too
-            storage_path = Path(self.storage_path)
-            storage_path.parent.mkdir(parents=True, exist_ok=True)
+            _ensure_dir(Path(self.storage_path).parent)
     
     def _get_default_db_path(self) -> str:
         """
@@ -226,32 +473,7 @@ class MemoryConfig:
         Returns:
             str: Absolute path to database file
         """
-        # Check for environment variable override first
-        if override_path := os.getenv("OPTIMUS_MEMORY_PATH"):
-            return str(Path(override_path).expanduser().resolve())
-        
-        try:
-            # Determine platform-appropriate base directory
-            if os.name == 'nt':  # Windows
-                base_dir = Path(os.getenv('APPDATA', Path.home() / 'AppData' / 'Roaming'))
-            else:  # Linux/Mac
-                base_dir = Path.home()
-            
-            # Create the optimus_ai subdirectory path
-            app_data_dir = base_dir / '.optimus_ai'
-            db_path = app_data_dir / 'memory.db'
-            
-            # Ensure directory exists
-            app_data_dir.mkdir(parents=True, exist_ok=True)
-            
-            return str(db_path)
-            
-        except (PermissionError, OSError) as e:
-            # Fallback to project directory if user directory fails
-            print(f"Warning: Could not access user directory ({e}), falling back to project directory")
-            fallback_dir = Path.cwd() / 'data'
-            fallback_dir.mkdir(parents=True, exist_ok=True)
-            return str(fallback_dir / 'memory.db')
+        return _resolve_default_db_path(os.getenv("OPTIMUS_MEMORY_PATH"))
     
     @classmethod
     def from_env(cls, **overrides) -> "MemoryConfig":
@@ -317,6 +539,18 @@ class MemoryConfig:
         if not self.safety.filter_sensitive_data:
             issues.append("SECURITY: Sensitive data filtering is disabled!")
         
+        if self.sqlite_journal_mode.upper() not in SQLITE_JOURNAL_MODES:
+            issues.append(f"ERROR: Unknown sqlite_journal_mode '{self.sqlite_journal_mode}'")
+        
+        if self.sqlite_synchronous.upper() not in SQLITE_SYNCHRONOUS_MODES:
+            issues.append(f"ERROR: Unknown sqlite_synchronous '{self.sqlite_synchronous}'")
+        
+        if self.limits.write_batch_size < 1:
+            issues.append("ERROR: write_batch_size must be at least 1")
+        
+        if self.sqlite_pool_size < 0:
+            issues.append("ERROR: sqlite_pool_size cannot be negative")
+        
         # Validate storage path accessibility
         try:
             storage_path = Path(self.storage_path)
@@ -36,10 +36,15 @@ Usage:
     context = memory.build_context_string()
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+from bisect import bisect_right
+from collections import OrderedDict
 from datetime import datetime, timezone
+from itertools import accumulate
 from dataclasses import replace
-import json
+import os
+import threading
+import time
 
 from memory.config import MemoryConfig, MemoryType, MemoryScope, RetentionPolicy
 from memory.models import Memory, User, Project, MemoryQuery
@@ -48,6 +53,88 @@ from memory.stores.base import MemoryStore
 from memory.stores.sqlite import SQLiteMemoryStore
 
 
+# RetentionPolicy label recorded for each memory type
+_POLICY_BY_TYPE: Dict[MemoryType, RetentionPolicy] = {
+    MemoryType.USER_PREFERENCE: RetentionPolicy.LONG_TERM,
+    MemoryType.LEARNED_CORRECTION: RetentionPolicy.LONG_TERM,
+    MemoryType.PROJECT_CONTEXT: RetentionPolicy.MEDIUM_TERM,
+    MemoryType.TOOL_PATTERN: RetentionPolicy.MEDIUM_TERM,
+    MemoryType.TASK_RESULT: RetentionPolicy.SHORT_TERM,
+    MemoryType.CONVERSATION: RetentionPolicy.SHORT_TERM,
+}
+
+# History is only added to the context when at least this much room is left
+_MIN_HISTORY_CHARS = 100
+
+# Users/projects remembered per manager by get_or_create_user/project
+_LOOKUP_CACHE_SIZE = 32
+
+
+def _lru_put(cache: OrderedDict, key: str, value: Any) -> None:
+    """Insert into a lookup cache, evicting the least recently used entry."""
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > _LOOKUP_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+# Process-wide registry of open stores keyed by database path.
+# Managers created for the same database share one warm connection
+# (and SQLite's page cache) instead of reconnecting on every initialize().
+_shared_stores: Dict[str, SQLiteMemoryStore] = {}
+_shared_store_refs: Dict[str, int] = {}
+_shared_store_lock = threading.Lock()
+
+# Default users resolved by current_user, keyed by (database path, user
+# name). User is frozen, so instances are safe to share between managers.
+# Guarded by _shared_store_lock, like the store registry.
+_default_users: Dict[Tuple[str, str], User] = {}
+
+
+def _db_path(config: MemoryConfig) -> str:
+    """The registry key for a config's database: one str per file, even if
+    storage_path is unset or was given as a Path."""
+    return os.fspath(config.storage_path or "memory.db")
+
+
+def _acquire_store(config: MemoryConfig) -> SQLiteMemoryStore:
+    """Return the shared store for the config's database, opening it if needed."""
+    db_path = _db_path(config)
+    
+    # Opening is synchronized so concurrent callers never race to create
+    # two connections (and two schema setups) for the same database.
+    with _shared_store_lock:
+        store = _shared_stores.get(db_path)
+        
+        if store is None:
+            # A new database file can't contain previously cached users
+            if not os.path.exists(db_path):
+                for key in [key for key in _default_users if key[0] == db_path]:
+                    del _default_users[key]
+            store = SQLiteMemoryStore(config, db_path)
+            store.initialize()
+            _shared_stores[db_path] = store
+            _shared_store_refs[db_path] = 0
+        
+        _shared_store_refs[db_path] += 1
+        return store
+
+
+def _release_store(store: SQLiteMemoryStore) -> None:
+    """Drop one reference to a shared store, closing it when unused."""
+    db_path = store.db_path
+    with _shared_store_lock:
+        if _shared_stores.get(db_path) is not store:
+            store.close()
+            return
+        
+        _shared_store_refs[db_path] -= 1
+        if _shared_store_refs[db_path] <= 0:
+            del _shared_stores[db_path]
+            del _shared_store_refs[db_path]
+            store.close()
+
+
 class MemoryManager:
     """
     High-level interface for agent memory operations.
@@ -101,6 +188,22 @@ class MemoryManager:
         # If someone passes their own store, we shouldn't close it
         self._owns_store: bool = False
         
+        # Cached build_context_string() results keyed by user, project and
+        # arguments. Writes through this manager bump _write_version, which
+        # invalidates them; entries also expire after the configured TTL.
+        self._write_version: int = 0
+        self._ctx_cache: Dict[tuple, Tuple[float, int, str]] = {}
+        
+        # Write-behind buffer for every write; see _enqueue() and flush().
+        # The lock keeps the timer's flush and ours in order.
+        self._pending: List[Memory] = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        
+        # get_or_create_* results keyed by user name / project path
+        self._user_cache: "OrderedDict[str, User]" = OrderedDict()
+        self._proj_cache: "OrderedDict[str, Project]" = OrderedDict()
+        
     @classmethod
     def initialize(
         cls,
@@ -143,10 +246,9 @@ class MemoryManager:
         if config is None:
             config = MemoryConfig()
         
-        # Step 2: Create and initialize the storage backend
+        # Step 2: Acquire the storage backend (shared per database path)
         # Note: config.storage_path is already resolved by MemoryConfig.__post_init__
-        store = SQLiteMemoryStore(config, config.storage_path or "memory.db")
-        store.initialize()
+        store = _acquire_store(config)
         
         # Step 3: Create the safety guard using config's safety settings
         safety_guard = MemorySafetyGuard(config.safety)
@@ -163,14 +265,25 @@ class MemoryManager:
         # Mark that we own the store (so we close it in cleanup)
         manager._owns_store = True
         
-        # Step 5: Set up user if name provided, otherwise defer to lazy loading
-        if user_name:
-            user = manager.get_or_create_user(user_name)
+        # Steps 5-6: Set up the user if a name was provided (otherwise defer
+        # to lazy loading) and the project if a path was provided. One read
+        # finds both on a warm start; missing ones are created together in
+        # one transaction (and one commit).
+        if user_name or project_path:
+            user, project = store.get_user_and_project(user_name, project_path)
+            
+            if (user_name and user is None) or (project_path and project is None):
+                with store.transaction():
+                    if user_name and user is None:
+                        user = manager.get_or_create_user(user_name)
+                    if project_path and project is None:
+                        project = manager.get_or_create_project(project_path)
+            
+            if user is not None:
+                _lru_put(manager._user_cache, user_name, user)
+            if project is not None:
+                _lru_put(manager._proj_cache, project_path, project)
             manager._current_user = user
-        
-        # Step 6: Set up project if path provided
-        if project_path:
-            project = manager.get_or_create_project(project_path)
             manager._current_project = project
         
         return manager
@@ -193,17 +306,15 @@ class MemoryManager:
         Returns:
             The User object (existing or newly created)
         """
-        # Try to find existing user by name
-        existing_user = self.store.get_user_by_name(name)
-        
-        if existing_user:
-            return existing_user
-        
-        # Create new user
-        new_user = User.create(name)
-        self.store.store_user(new_user)
-        
-        return new_user
+        user = self._user_cache.get(name)
+        if user is not None:
+            self._user_cache.move_to_end(name)
+            return user
+        
+        # The store resolves "exists or create" in one atomic step
+        user = self.store.upsert_user_by_name(name)
+        _lru_put(self._user_cache, name, user)
+        return user
     
     def set_current_user(self, user: User) -> None:
         """
@@ -215,6 +326,7 @@ class MemoryManager:
             user: The User object to set as current
         """
         self._current_user = user
+        self._write_version += 1
         
     def add_user_tag(self, tag: str) -> User:
         """
@@ -235,9 +347,15 @@ class MemoryManager:
         
         # 4. Persist the new version to the database
         self.store.store_user(updated_user)
+        self._user_cache.pop(updated_user.name, None)
+        cache_key = (_db_path(self.config), updated_user.name)
+        with _shared_store_lock:
+            if cache_key in _default_users:
+                _default_users[cache_key] = updated_user
         
         # 5. Update our current session reference
         self._current_user = updated_user
+        self._write_version += 1
         
         return updated_user
     
@@ -257,9 +375,18 @@ class MemoryManager:
             created when first accessed.
         """
         if self._current_user is None:
-            # Lazy load: create/get default user from config
+            # Lazy load: create/get default user from config, reusing the
+            # one resolved by an earlier manager for the same database
             default_name = self.config.default_user_id
-            self._current_user = self.get_or_create_user(default_name)
+            cache_key = (_db_path(self.config), default_name)
+            with _shared_store_lock:
+                user = _default_users.get(cache_key)
+            if user is None:
+                # Resolved outside the lock; a concurrent winner is kept
+                user = self.get_or_create_user(default_name)
+                with _shared_store_lock:
+                    user = _default_users.setdefault(cache_key, user)
+            self._current_user = user
         
         return self._current_user
     
@@ -280,17 +407,15 @@ class MemoryManager:
         Returns:
             The Project object (existing or newly created)
         """
-        # Try to find existing project by path hash
-        existing_project = self.store.get_project_by_path(path)
-        
-        if existing_project:
-            return existing_project
-        
-        # Create new project
-        new_project = Project.from_path(path)
-        self.store.store_project(new_project)
-        
-        return new_project
+        project = self._proj_cache.get(path)
+        if project is not None:
+            self._proj_cache.move_to_end(path)
+            return project
+        
+        # The hash comes from from_path; the store resolves existence atomically
+        project = self.store.upsert_project_by_path_hash(Project.from_path(path))
+        _lru_put(self._proj_cache, path, project)
+        return project
     
     def set_current_project(self, project: Optional[Project]) -> None:
         """
@@ -303,6 +428,7 @@ class MemoryManager:
             project: The Project object to set, or None to clear
         """
         self._current_project = project
+        self._write_version += 1
     
     @property
     def current_project(self) -> Optional[Project]:
@@ -325,10 +451,14 @@ class MemoryManager:
         """
         Close the memory manager and release resources.
         
-        Only closes the store if we created it (via initialize()).
+        Only releases the store if we acquired it (via initialize()).
+        The shared connection is closed once its last manager is closed.
+        Buffered writes are flushed first.
         """
+        self.flush()
         if self._owns_store and self.store:
-            self.store.close()
+            _release_store(self.store)
+            self._owns_store = False
     
     def __enter__(self) -> "MemoryManager":
         """Context manager entry."""
@@ -354,38 +484,113 @@ class MemoryManager:
         """
         Internal helper to centralize memory creation logic.
         
+        Builds the memory via _build_memory() and queues it via _enqueue().
+        """
+        memory = self._build_memory(
+            content=content,
+            memory_type=memory_type,
+            scope=scope,
+            importance=importance,
+            metadata=metadata,
+            tags=tags,
+        )
+        
+        self._enqueue([memory])
+        return memory
+    
+    def _enqueue(self, memories: List[Memory], flush: bool = False) -> None:
+        """
+        Queue memories behind anything already buffered, so writes reach
+        the store in call order.
+        
+        The buffer is flushed once write_batch_size memories are pending
+        (or right away if flush is set), and otherwise by a timer
+        write_flush_interval_ms after the first one was queued.
+        """
+        self._write_version += 1
+        limits = self.config.limits
+        with self._pending_lock:
+            first = not self._pending
+            self._pending.extend(memories)
+            due = flush or len(self._pending) >= limits.write_batch_size
+            if first and not due:
+                self._flush_timer = threading.Timer(
+                    limits.write_flush_interval_ms / 1000, self.flush
+                )
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+        if due:
+            self.flush()
+    
+    def flush(self) -> int:
+        """
+        Persist buffered memories in a single store_many() transaction.
+        
+        Reads through this manager flush first, so they always see its
+        own writes.
+        
+        Returns:
+            The number of memories written
+        """
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending:
+                return 0
+            
+            pending, self._pending = self._pending, []
+            self.store.store_many(pending)
+        return len(pending)
+    
+    def _build_memory(
+        self,
+        content: str,
+        memory_type: MemoryType,
+        scope: MemoryScope,
+        importance: float,
+        metadata: Optional[Dict[str, Any]] = None,
+        tags: Optional[List[str]] = None,
+        presanitized: bool = False,
+        now: Optional[datetime] = None,
+    ) -> Memory:
+        """
+        Build a Memory without persisting it.
+        
         Handles:
         - Content sanitization (SECURITY)
         - ID resolution (User/Project)
         - Expiration calculation
-        - Object creation and storage
+        - Object creation
+        
+        Batch callers pass `now` so the clock is read once per batch.
         """
         # Sanitize content to prevent secret leakage
-        sanitization_result = self.safety.sanitize_content(content)
-        sanitized_content = sanitization_result.content
+        # (batch callers sanitize up front with sanitize_many)
+        if presanitized:
+            sanitized_content = content
+        else:
+            sanitized_content = self.safety.sanitize_content(content).content
         
         # Determine ownership based on current context
         # Always attach user_id if we have a current user
-        user_id = self.current_user.id if self.current_user else None
+        # (read the lazy-loading property once)
+        user = self.current_user
+        user_id = user.id if user else None
         
         # Attach project_id if we have a current project
         # (Even for USER scope, it's useful to know where it happened)
-        project_id = self.current_project.id if self.current_project else None
+        project = self._current_project
+        project_id = project.id if project else None
         
         # Calculate expiration based on retention policy
-        ttl = self.config.retention.get_ttl(memory_type)
-        expires_at = datetime.now(timezone.utc) + ttl
+        if now is None:
+            now = datetime.now(timezone.utc)
+        expires_at = now + self.config.retention.get_ttl(memory_type)
         
         # Determine the RetentionPolicy label based on type
-        policy_map = {
-            MemoryType.USER_PREFERENCE: RetentionPolicy.LONG_TERM,
-            MemoryType.LEARNED_CORRECTION: RetentionPolicy.LONG_TERM,
-            MemoryType.PROJECT_CONTEXT: RetentionPolicy.MEDIUM_TERM,
-            MemoryType.TOOL_PATTERN: RetentionPolicy.MEDIUM_TERM,
-            MemoryType.TASK_RESULT: RetentionPolicy.SHORT_TERM,
-            MemoryType.CONVERSATION: RetentionPolicy.SHORT_TERM,
-        }
-        policy = policy_map.get(memory_type, RetentionPolicy.SHORT_TERM)
+        policy = _POLICY_BY_TYPE.get(memory_type, RetentionPolicy.SHORT_TERM)
         
         # Create the memory object
         memory = Memory.create(
@@ -398,11 +603,11 @@ class MemoryManager:
             tags=tags,
             metadata=metadata or {},
             expires_at=expires_at,
-            retention_policy=policy
+            retention_policy=policy,
+            now=now
         )
         
-        # Persist to storage
-        return self.store.store(memory)
+        return memory
     
     # =========================================================================
     # High-Level Storage Operations
@@ -423,7 +628,7 @@ class MemoryManager:
         - USER scope otherwise
         """
         # Format the interaction clearly
-        content = f"User: {user_message}\nAssistant: {assistant_response}"
+        content = self._conversation_content(user_message, assistant_response)
         
         # Determine scope based on whether we are in a project
         scope = MemoryScope.PROJECT if self.current_project else MemoryScope.USER
@@ -438,6 +643,50 @@ class MemoryManager:
             importance=importance,
             tags=tags
         )
+    
+    def store_conversations_bulk(
+        self,
+        exchanges: List[Tuple[str, str]],
+        importance: float = 0.1,
+        tags: list[str] | str = "chat"
+    ) -> List[Memory]:
+        """
+        Store several chat exchanges (e.g. a replayed or imported session)
+        in a single write.
+        
+        Args:
+            exchanges: (user_message, assistant_response) tuples, oldest first
+        """
+        contents = [
+            self._conversation_content(user_message, assistant_response)
+            for user_message, assistant_response in exchanges
+        ]
+        sanitized = self.safety.sanitize_many(contents)
+        
+        scope = MemoryScope.PROJECT if self.current_project else MemoryScope.USER
+        if isinstance(tags, str):
+            tags = [tags]
+        
+        # Each memory reads the clock itself so the exchanges keep their order
+        memories = [
+            self._build_memory(
+                content=result.content,
+                memory_type=MemoryType.CONVERSATION,
+                scope=scope,
+                importance=importance,
+                tags=list(tags),
+                presanitized=True,
+            )
+            for result in sanitized
+        ]
+        
+        # Ride along with anything already buffered: one transaction, in order
+        self._enqueue(memories, flush=True)
+        return memories
+    
+    @staticmethod
+    def _conversation_content(user_message: str, assistant_response: str) -> str:
+        return f"User: {user_message}\nAssistant: {assistant_response}"
         
     def soft_delete_last_conversation(self) -> bool:
         """
@@ -446,6 +695,7 @@ class MemoryManager:
         """
         # 1. Get the absolute last conversation directly from store
         # We bypass get_recent_conversations to ensure we see raw data
+        self.flush()
         query = MemoryQuery(
             user_id=self.current_user.id,
             include_no_project=True,
@@ -467,7 +717,7 @@ class MemoryManager:
         # 3. Add the tag and save
         new_tags = current_tags + ["ignore"]
         updated_mem = replace(last_mem, tags=new_tags)
-        self.store.store(updated_mem)
+        self._enqueue([updated_mem], flush=True)
         
         return True
         
@@ -540,27 +790,71 @@ class MemoryManager:
         Scope is GLOBAL because a good way to use a tool is valid 
         regardless of the user or project.
         """
-        content = f"Tool: {tool_name}\nPattern: {pattern}\nResult: {'Success' if success else 'Failure'}"
+        content = self._tool_pattern_content(tool_name, pattern, success)
+        memory = self._build_tool_pattern(tool_name, content, importance)
+        self._enqueue([memory])
+        return memory
+    
+    def store_tool_patterns_bulk(
+        self,
+        patterns: List[Tuple[str, str, bool, float]]
+    ) -> List[Memory]:
+        """
+        Record several tool usage patterns in a single write.
         
-        return self._create_and_store(
+        Args:
+            patterns: (tool_name, pattern, success, importance) tuples
+        """
+        contents = [
+            self._tool_pattern_content(tool_name, pattern, success)
+            for tool_name, pattern, success, _ in patterns
+        ]
+        sanitized = self.safety.sanitize_many(contents)
+        
+        # One timestamp for the whole batch
+        now = datetime.now(timezone.utc)
+        memories = [
+            self._build_tool_pattern(tool_name, result.content, importance, presanitized=True, now=now)
+            for (tool_name, _, _, importance), result in zip(patterns, sanitized)
+        ]
+        self._enqueue(memories, flush=True)
+        return memories
+    
+    @staticmethod
+    def _tool_pattern_content(tool_name: str, pattern: str, success: bool) -> str:
+        return f"Tool: {tool_name}\nPattern: {pattern}\nResult: {'Success' if success else 'Failure'}"
+    
+    def _build_tool_pattern(
+        self,
+        tool_name: str,
+        content: str,
+        importance: float,
+        presanitized: bool = False,
+        now: Optional[datetime] = None
+    ) -> Memory:
+        """Build (but don't persist) a GLOBAL tool pattern memory."""
+        return self._build_memory(
             content=content,
             memory_type=MemoryType.TOOL_PATTERN,
             scope=MemoryScope.GLOBAL,
             importance=importance,
-            tags=["tool", "pattern", tool_name]
+            tags=["tool", "pattern", tool_name],
+            presanitized=presanitized,
+            now=now
         )
     
     def get_tool_patterns(self, limit: int = 5) -> List[Memory]:
         """
         Retrieve successful tool usage patterns to guide the agent.
         """
-        query = MemoryQuery(
+        return self.store.query(self._tool_patterns_query(limit))
+    
+    def _tool_patterns_query(self, limit: int) -> MemoryQuery:
+        return MemoryQuery(
             scopes=[MemoryScope.GLOBAL],
             memory_types=[MemoryType.TOOL_PATTERN],
             limit=limit
         )
-
-        return self.store.query(query)
         
     def get_recent_conversations(
         self, 
@@ -571,20 +865,25 @@ class MemoryManager:
         Retrieve recent chat history.
         Filters out memories tagged with 'ignore'.
         """
+        self.flush()
+        memories = self.store.query(self._recent_conversations_query(limit, include_project))
+        return self._drop_ignored(memories, limit)
+    
+    def _recent_conversations_query(self, limit: int, include_project: bool = True) -> MemoryQuery:
         query_project_id = self.current_project.id if include_project and self.current_project else None
         
         # We fetch a slightly larger batch (limit + 5) to account for 
         # potentially ignored items, ensuring we still return a full 'limit'
-        query = MemoryQuery(
+        return MemoryQuery(
             user_id=self.current_user.id,
             project_id=query_project_id,
             include_no_project=True,
             memory_types=[MemoryType.CONVERSATION],
             limit=limit + 5 
         )
-        
-        memories = self.store.query(query)
-        
+    
+    @staticmethod
+    def _drop_ignored(memories: List[Memory], limit: int) -> List[Memory]:
         # Filter out any memory that has the 'ignore' tag
         valid_memories = [m for m in memories if "ignore" not in (m.tags or [])]
         
@@ -596,27 +895,32 @@ class MemoryManager:
         Retrieve context for the current active project.
         Returns empty list if no project is active.
         """
+        self.flush()
+        query = self._project_context_query()
+        return self.store.query(query) if query else []
+    
+    def _project_context_query(self) -> Optional[MemoryQuery]:
         if not self.current_project:
-            return []
+            return None
         
-        query = MemoryQuery(
+        return MemoryQuery(
             user_id=self.current_user.id,
             project_id=self.current_project.id,
             memory_types=[MemoryType.PROJECT_CONTEXT]
         )
         
-        return self.store.query(query)
-        
     def get_user_preferences(self) -> List[Memory]:
         """
         Retrieve all preferences for the current user.
         """
-        query = MemoryQuery(
+        self.flush()
+        return self.store.query(self._user_preferences_query())
+    
+    def _user_preferences_query(self) -> MemoryQuery:
+        return MemoryQuery(
             user_id=self.current_user.id,
             memory_types=[MemoryType.USER_PREFERENCE]
         )
-        
-        return self.store.query(query)
     
     def get_relevant_corrections(
         self,
@@ -625,13 +929,15 @@ class MemoryManager:
         """
         Retrieve recent corrections to prevent repeating mistakes.
         """
-        query = MemoryQuery(
+        self.flush()
+        return self.store.query(self._corrections_query(limit))
+    
+    def _corrections_query(self, limit: int) -> MemoryQuery:
+        return MemoryQuery(
             user_id=self.current_user.id,
             memory_types=[MemoryType.LEARNED_CORRECTION],
             limit=limit
         )
-        
-        return self.store.query(query)
     
     def build_context_string(
         self,
@@ -653,17 +959,56 @@ class MemoryManager:
         5. Conversation History (Fills remaining space)
         
         Learned Corrections are added at the end of the context window to avoid recency bias
+        
+        The result is cached per user, project and arguments, and reused
+        until a write through this manager or the cache TTL expires.
         """
         # Resolve limit from config if not provided
         if max_chars is None:
             max_chars = self.config.limits.max_context_chars
+        
+        # Buffered writes must be visible to the queries below
+        self.flush()
+        
+        cache_key = (
+            self.current_user.id,
+            self.current_project.id if self.current_project else None,
+            include_preferences, include_project, include_history,
+            include_corrections, include_tool_pattern, max_chars
+        )
+        cached = self._ctx_cache.get(cache_key)
+        if cached:
+            cached_at, version, context = cached
+            if (version == self._write_version
+                    and time.monotonic() - cached_at < self.config.limits.context_cache_ttl_seconds):
+                return context
             
         # --- PHASE 1: Retrieve Data ---
-        history = self.get_recent_conversations(limit=50) if include_history else []
-        corrections = self.get_relevant_corrections() if include_corrections else []
-        preferences = self.get_user_preferences() if include_preferences else []
-        project_context = self.get_project_context() if include_project else []
-        tool_pattern = self.get_tool_patterns() if include_tool_pattern else []
+        # Every enabled section is fetched in a single store round-trip.
+        # History can never fit a budget below the minimum, so skip it then;
+        # and with 10 chars of overhead per message, at most max_chars // 10
+        # messages can fit, so small budgets fetch fewer rows.
+        fetch_history = include_history and max_chars >= _MIN_HISTORY_CHARS
+        history_limit = min(50, max_chars // 10)
+        queries = {
+            "history": self._recent_conversations_query(limit=history_limit) if fetch_history else None,
+            "corrections": self._corrections_query(limit=10) if include_corrections else None,
+            "preferences": self._user_preferences_query() if include_preferences else None,
+            "project": self._project_context_query() if include_project else None,
+            "tool_pattern": self._tool_patterns_query(limit=5) if include_tool_pattern else None,
+        }
+        # Only content, tags and expiry are used here, so metadata isn't read
+        active = {
+            name: replace(query, include_metadata=False)
+            for name, query in queries.items() if query is not None
+        }
+        results = dict(zip(active, self.store.query_many(list(active.values()))))
+        
+        history = self._drop_ignored(results.get("history", []), history_limit)
+        corrections = results.get("corrections", [])
+        preferences = results.get("preferences", [])
+        project_context = results.get("project", [])
+        tool_pattern = results.get("tool_pattern", [])
         
         # --- PHASE 2: Prepare the "Anchor" (Corrections) ---
         # We build this string FIRST to know exactly how much space to reserve
@@ -687,13 +1032,19 @@ class MemoryManager:
             if not items:
                 return
             
-            section_content = "\n".join([f"- {m.content}" for m in items])
-            section_text = f"\n=== {header} ===\n{section_content}\n"
+            # Measure before building: "\n=== header ===\n" plus "- content\n"
+            # per item. Stop counting as soon as the section can't fit in the
+            # AVAILABLE space (excluding reserved correction space).
+            budget = available_chars - current_chars
+            section_chars = len(header) + 10
+            for m in items:
+                section_chars += len(m.content) + 3
+                if section_chars > budget:
+                    return
             
-            # Only add if it fits in the AVAILABLE space (excluding reserved correction space)
-            if current_chars + len(section_text) <= available_chars:
-                parts.append(section_text)
-                current_chars += len(section_text)
+            parts.append(f"\n=== {header} ===\n")
+            parts.extend([f"- {m.content}\n" for m in items])
+            current_chars += section_chars
 
         # 1. Tool Patterns
         add_section("Tool Patterns", tool_pattern)
@@ -708,16 +1059,11 @@ class MemoryManager:
         if history:
             remaining_chars = available_chars - current_chars
             
-            if remaining_chars >= 100: # Ensure we have at least a little room
-                selected_history = []
-                for mem in history:
-                    # Estimate size: content + overhead for formatting
-                    mem_size = len(mem.content) + 10
-                    if mem_size <= remaining_chars:
-                        selected_history.append(mem)
-                        remaining_chars -= mem_size
-                    else:
-                        break
+            if remaining_chars >= _MIN_HISTORY_CHARS: # Ensure we have at least a little room
+                # Estimate size: content + overhead for formatting. Keep the
+                # newest messages whose running total still fits.
+                running_sizes = list(accumulate(len(mem.content) + 10 for mem in history))
+                selected_history = history[:bisect_right(running_sizes, remaining_chars)]
                 
                 # Add history if we found any fits (reversed back to chronological order)
                 if selected_history:
@@ -730,4 +1076,14 @@ class MemoryManager:
         # Combine: [Body] + [Corrections at the End]
         final_context = f"{body}\n{corrections_text}".strip()
         
-        return final_context
\ No newline at end of file
+        self._remember_context(cache_key, final_context)
+        
+        return final_context
+    
+    def _remember_context(self, cache_key: tuple, context: str) -> None:
+        # Entries from before the last write can never be served again
+        self._ctx_cache = {
+            key: entry for key, entry in self._ctx_cache.items()
+            if entry[1] == self._write_version
+        }
+        self._ctx_cache[cache_key] = (time.monotonic(), self._write_version, context)
\ No newline at end of file
@@ -16,21 +16,51 @@ The models follow a hierarchy:
 - Project: Identifies which project context the memory is associated with
 """
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional, Any
-from enum import Enum
-import uuid
+import hashlib
+import os
+import secrets
+from sys import intern
 
 # Import our enums from config to maintain single source of truth
-from memory.config import MemoryType, MemoryScope, RetentionPolicy
+from memory.config import (
+    MemoryType, MemoryScope, RetentionPolicy, parse_enum,
+    MEMORY_SCOPE_BY_VALUE, MEMORY_TYPE_BY_VALUE,
+)
+
+
+# Bound once at import; these sit on every model construction path
+_UTC = timezone.utc
+_now = datetime.now
+
+
+def _utc_now() -> datetime:
+    """Current time as an aware UTC datetime."""
+    return _now(_UTC)
+
+
+def hash_project_path(absolute_path: str) -> str:
+    """
+    Stable identifier hash for a project path.
+    
+    The hash only has to tell paths apart, not resist attack, so BLAKE2b
+    with a 128-bit digest is used; it is faster than SHA256 on short inputs.
+    """
+    return hashlib.blake2b(absolute_path.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def legacy_project_path_hash(absolute_path: str) -> str:
+    """The SHA256 path hash used before hash_project_path(), for migration."""
+    return hashlib.sha256(absolute_path.encode()).hexdigest()
 
 
 # =============================================================================
 # Identity Models
 # =============================================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class User:
     """
     Represents a user of the agent.
@@ -51,6 +81,8 @@ class User:
     name: str
     created_at: datetime
     tags: list[str] = field(default_factory=list)
+    # Memoized created_at.isoformat(); see created_at_iso
+    _created_at_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     @classmethod
     def create(cls, name: str) -> "User":
@@ -64,17 +96,27 @@ class User:
             New User instance with UUID and current timestamp
         """
         return cls(
-            id=f"usr_{uuid.uuid4().hex[:12]}",
+            id=f"usr_{secrets.token_hex(6)}",
             name=name,
-            created_at=datetime.now(timezone.utc)
+            created_at=_now(_UTC)
         )
     
+    @property
+    def created_at_iso(self) -> str:
+        """created_at as an ISO string, formatted once per instance."""
+        iso = self._created_at_iso
+        if iso is None:
+            iso = self.created_at.isoformat()
+            # Frozen: memoize past the dataclass __setattr__ guard
+            object.__setattr__(self, "_created_at_iso", iso)
+        return iso
+    
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for storage."""
         return {
             "id": self.id,
             "name": self.name,
-            "created_at": self.created_at.isoformat()
+            "created_at": self.created_at_iso
         }
     
     @classmethod
@@ -90,7 +132,7 @@ class User:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Project:
     """
     Represents a project/codebase the agent is working on.
@@ -101,7 +143,7 @@ class Project:
     Attributes:
         id: Stable identifier (hash-based), e.g., "proj_a1b2c3d4"
         name: Human-readable name (usually directory name)
-        path_hash: SHA256 hash of absolute path for matching
+        path_hash: BLAKE2b hash of absolute path for matching (see hash_project_path)
         last_known_path: The actual path (for display/debugging only)
         created_at: When this project was first seen
     
@@ -115,6 +157,8 @@ class Project:
     last_known_path: str
     created_at: datetime
     tags: list[str] = field(default_factory=list)
+    # Memoized created_at.isoformat(); see created_at_iso
+    _created_at_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     @classmethod
     def from_path(cls, absolute_path: str, hasher=None) -> "Project":
@@ -123,17 +167,14 @@ class Project:
         
         Args:
             absolute_path: The absolute path to the project directory
-            hasher: Optional hash function (for testing). Defaults to SHA256.
+            hasher: Optional hash function (for testing). Defaults to hash_project_path.
             
         Returns:
             New Project instance
         """
-        import hashlib
-        import os
-        
-        # Use provided hasher or default to SHA256
+        # Use provided hasher or default to BLAKE2b
         if hasher is None:
-            path_hash = hashlib.sha256(absolute_path.encode()).hexdigest()
+            path_hash = hash_project_path(absolute_path)
         else:
             path_hash = hasher(absolute_path)
         
@@ -145,9 +186,19 @@ class Project:
             name=name,
             path_hash=path_hash,
             last_known_path=absolute_path,
-            created_at=datetime.now(timezone.utc)
+            created_at=_now(_UTC)
         )
     
+    @property
+    def created_at_iso(self) -> str:
+        """created_at as an ISO string, formatted once per instance."""
+        iso = self._created_at_iso
+        if iso is None:
+            iso = self.created_at.isoformat()
+            # Frozen: memoize past the dataclass __setattr__ guard
+            object.__setattr__(self, "_created_at_iso", iso)
+        return iso
+    
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for storage."""
         return {
@@ -155,7 +206,7 @@ class Project:
             "name": self.name,
             "path_hash": self.path_hash,
             "last_known_path": self.last_known_path,
-            "created_at": self.created_at.isoformat()
+            "created_at": self.created_at_iso
         }
     
     @classmethod
@@ -177,7 +228,7 @@ class Project:
 # Core Memory Model
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Memory:
     """
     The core unit of stored information.
@@ -233,8 +284,8 @@ class Memory:
     project_id: Optional[str] = None
     
     # Timestamps
-    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = field(default_factory=_utc_now)
+    updated_at: datetime = field(default_factory=_utc_now)
     expires_at: Optional[datetime] = None
     
     # Retrieval metadata
@@ -259,6 +310,37 @@ class Memory:
         if self.scope == MemoryScope.PROJECT and not self.project_id:
             raise ValueError("PROJECT-scoped memories must have a project_id")
     
+    @classmethod
+    def _unchecked(
+        cls, id, content, memory_type, scope, retention_policy, user_id, project_id,
+        created_at, updated_at, expires_at, importance, access_count,
+        last_accessed_at, tags, source, metadata,
+    ) -> "Memory":
+        """
+        Construct a memory without running __post_init__ validation.
+        
+        Only for rows read back from our own store, which were validated
+        when they were first created. Arguments are in field order.
+        """
+        memory = object.__new__(cls)
+        memory.id = id
+        memory.content = content
+        memory.memory_type = memory_type
+        memory.scope = scope
+        memory.retention_policy = retention_policy
+        memory.user_id = user_id
+        memory.project_id = project_id
+        memory.created_at = created_at
+        memory.updated_at = updated_at
+        memory.expires_at = expires_at
+        memory.importance = importance
+        memory.access_count = access_count
+        memory.last_accessed_at = last_accessed_at
+        memory.tags = tags
+        memory.source = source
+        memory.metadata = metadata
+        return memory
+    
     @classmethod
     def create(
         cls,
@@ -272,7 +354,8 @@ class Memory:
         source: str = "unknown",
         metadata: Optional[dict[str, Any]] = None,
         expires_at: Optional[datetime] = None,
-        retention_policy: RetentionPolicy = RetentionPolicy.SHORT_TERM
+        retention_policy: RetentionPolicy = RetentionPolicy.SHORT_TERM,
+        now: Optional[datetime] = None
     ) -> "Memory":
         """
         Factory method to create a new memory with generated ID.
@@ -289,13 +372,16 @@ class Memory:
             metadata: Additional structured data
             expires_at: When to auto-delete (None = use retention policy)
             retention_policy: Optional retention policy setting
+            now: Creation timestamp (None = current UTC time). Lets batch
+                callers read the clock once for the whole batch.
             
         Returns:
             New Memory instance
         """
-        now = datetime.now(timezone.utc)
+        if now is None:
+            now = _now(_UTC)
         return cls(
-            id=f"mem_{uuid.uuid4().hex[:16]}",
+            id=f"mem_{secrets.token_hex(8)}",
             content=content,
             memory_type=memory_type,
             scope=scope,
@@ -316,18 +402,18 @@ class Memory:
     def mark_accessed(self) -> None:
         """Update access tracking when this memory is retrieved."""
         self.access_count += 1
-        self.last_accessed_at = datetime.now(timezone.utc)
+        self.last_accessed_at = _now(_UTC)
     
     def update_content(self, new_content: str) -> None:
         """Update the memory's content and timestamp."""
         self.content = new_content
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at = _now(_UTC)
     
     def is_expired(self) -> bool:
         """Check if this memory has passed its expiration date."""
         if self.expires_at is None:
             return False
-        return datetime.now(timezone.utc) > self.expires_at
+        return _now(_UTC) > self.expires_at
     
     def to_dict(self) -> dict[str, Any]:
         """
@@ -370,18 +456,21 @@ class Memory:
         return cls(
             id=data["id"],
             content=data["content"],
-            memory_type=MemoryType(data["memory_type"]),
-            scope=MemoryScope(data["scope"]),
+            memory_type=(MEMORY_TYPE_BY_VALUE.get(data["memory_type"])
+                         or parse_enum(MemoryType, data["memory_type"])),
+            scope=MEMORY_SCOPE_BY_VALUE.get(data["scope"]) or parse_enum(MemoryScope, data["scope"]),
             user_id=data.get("user_id"),
             project_id=data.get("project_id"),
-            created_at=parse_datetime(data["created_at"]) or datetime.now(timezone.utc),
-            updated_at=parse_datetime(data["updated_at"]) or datetime.now(timezone.utc),
+            created_at=parse_datetime(data["created_at"]) or _now(_UTC),
+            updated_at=parse_datetime(data["updated_at"]) or _now(_UTC),
             expires_at=parse_datetime(data.get("expires_at")),
             importance=data.get("importance", 0.5),
             access_count=data.get("access_count", 0),
             last_accessed_at=parse_datetime(data.get("last_accessed_at")),
-            tags=data.get("tags", []),
-            source=data.get("source", "unknown"),
+            # Sources and tags come from a small vocabulary; interning lets
+            # every loaded memory share one string object per value
+            tags=[intern(tag) for tag in data.get("tags") or []],
+            source=intern(data["source"]) if data.get("source") is not None else "unknown",
             metadata=data.get("metadata", {}),
         )
     
@@ -398,7 +487,7 @@ class Memory:
 # Query/Filter Models
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class MemoryQuery:
     """
     Represents a query for retrieving memories.
@@ -440,6 +529,7 @@ class MemoryQuery:
     # Result control
     limit: int = 100
     offset: int = 0
+    include_metadata: bool = True  # False = skip reading metadata (returned as {})
     
     # Ordering
     order_by: str = "created_at"  # created_at, updated_at, importance, access_count
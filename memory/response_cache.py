@@ -0,0 +1,120 @@
+"""
+Response Cache Module
+
+Remembers the final answer given to a prompt so that asking the same
+question again in the same situation is answered without another model call.
+
+Prompts are matched after normalizing case and whitespace, together with a
+bounded context: the answer that preceded them (empty for the first turn).
+Follow-ups such as "why?" or "continue" mean different things after
+different answers, while a question opening a session matches the same
+question opening any other session. Only answers the model produced without
+running tools should be cached: tool results depend on the state of the
+working directory, which may have changed since.
+
+Given a path, entries are saved to a JSON file (next to the memory database)
+so repeated CLI invocations of the same query can hit.
+
+Usage:
+    cache = ResponseCache(ttl=config.retention.conversation_ttl, path=cache_path)
+    answer = cache.get(prompt, context=previous_answer)
+    if answer is None:
+        answer = ...  # ask the model
+        cache.put(prompt, answer, context=previous_answer)
+"""
+
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Optional, Tuple
+import hashlib
+import json
+import os
+import time
+
+
+class ResponseCache:
+    """
+    Bounded, time-limited map from normalized prompts to final answers.
+
+    Entries expire after `ttl`; once `max_entries` is reached the least
+    recently used entry is evicted. With a `path`, entries are loaded from
+    and saved to that file.
+    """
+
+    def __init__(self, ttl: timedelta, max_entries: int = 256, path: Optional[str] = None):
+        self.ttl_seconds = ttl.total_seconds()
+        self.max_entries = max_entries
+        self.path = path
+        # Wall-clock timestamps, so entries loaded from disk expire correctly
+        self._entries: OrderedDict[Tuple[str, str], Tuple[float, str]] = OrderedDict()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(prompt: str, context: str) -> Tuple[str, str]:
+        # The context is a whole answer; a digest keeps keys (and the file) small
+        context_key = hashlib.blake2b(context.encode(), digest_size=16).hexdigest() if context else ""
+        return context_key, " ".join(prompt.lower().split())
+
+    def get(self, prompt: str, context: str = "") -> Optional[str]:
+        """Return the cached answer for a prompt after a context, or None on a miss."""
+        key = self._key(prompt, context)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, response = entry
+        if time.time() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self._save()
+            return None
+
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, prompt: str, response: str, context: str = "") -> None:
+        """Cache the answer given to a prompt after a context."""
+        key = self._key(prompt, context)
+        if not key[1]:
+            return
+
+        self._entries[key] = (time.time(), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._save()
+
+    def clear(self) -> None:
+        """Forget every cached answer (e.g. after a correction)."""
+        self._entries.clear()
+        self._save()
+
+    def _load(self) -> None:
+        """Read saved entries, skipping expired ones; a missing or unreadable file is empty."""
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        now = time.time()
+        try:
+            for context_key, prompt_key, stored_at, response in saved[-self.max_entries:]:
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries[(context_key, prompt_key)] = (stored_at, response)
+        except (TypeError, ValueError):
+            self._entries.clear()
+
+    def _save(self) -> None:
+        """Write entries oldest first, replacing the file atomically."""
+        if not self.path:
+            return
+        rows = [[*key, stored_at, response] for key, (stored_at, response) in self._entries.items()]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
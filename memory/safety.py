@@ -22,6 +22,7 @@ Usage:
 import re
 import os
 import hashlib
+from functools import lru_cache
 from dataclasses import dataclass, field
 from typing import Optional
 from enum import Enum
@@ -43,7 +44,7 @@ class SanitizationAction(Enum):
     BLOCKED = "blocked"              # Content was entirely rejected
 
 
-@dataclass
+@dataclass(slots=True)
 class SanitizationResult:
     """
     Result of sanitizing content.
@@ -67,7 +68,7 @@ class SanitizationResult:
         return SanitizationAction.BLOCKED in self.actions
 
 
-@dataclass
+@dataclass(slots=True)
 class PathValidationResult:
     """
     Result of validating a file path.
@@ -79,6 +80,42 @@ class PathValidationResult:
     error_message: str = ""
     
 
+@lru_cache(maxsize=4096)
+def _check_path(file_path: str, working_directory: str) -> tuple[bool, str, str]:
+    """
+    MemorySafetyGuard.validate_path() checks, as (is_safe, normalized_path,
+    error_message).
+    
+    The checks are pure path arithmetic, and the agent validates the same
+    few paths against one working directory over and over, so results are
+    cached. The process never changes its cwd, so resolving a relative
+    working directory once is safe.
+    """
+    try:
+        # Get absolute path of working directory
+        working_dir_abs = os.path.abspath(working_directory)
+        
+        # Normalize the target path (resolves ../, ./, etc.)
+        # Join with working dir first to handle relative paths
+        target_path = os.path.normpath(os.path.join(working_dir_abs, file_path))
+        
+        # THE CRITICAL CHECK: Is target within working directory?
+        # Both paths are normalized, so a string prefix test is enough, as
+        # long as the prefix ends at a separator ("/work" must not admit
+        # "/work_evil"). A root directory already ends with one.
+        prefix = working_dir_abs if working_dir_abs.endswith(os.sep) else working_dir_abs + os.sep
+        is_valid = target_path == working_dir_abs or target_path.startswith(prefix)
+        
+        if is_valid:
+            return True, target_path, ""
+        else:
+            return False, "", f'Path "{file_path}" escapes the permitted working directory'
+            
+    except (ValueError, OSError) as e:
+        # Handle edge cases like paths on different drives (Windows)
+        return False, "", f'Invalid path "{file_path}": {e}'
+
+
 class MemorySafetyGuard:
     """
     Main security gatekeeper for the memory system.
@@ -97,6 +134,15 @@ class MemorySafetyGuard:
         True
     """
     
+    # Fixed attribute set; no per-instance __dict__
+    __slots__ = (
+        "settings",
+        "_sensitive_regexes",
+        "_sensitive_prescreen",
+        "_blocked_regex",
+        "_blocked_literals",
+    )
+    
     # Replacement text for redacted content
     REDACTION_MARKER = "[REDACTED]"
     
@@ -113,27 +159,16 @@ class MemorySafetyGuard:
         self.settings = settings or SafetySettings()
         
         # Pre-compile regex patterns for performance
-        # These are compiled once at initialization, not on every call
-        self._compiled_sensitive_patterns: list[re.Pattern] = []
+        # Patterns are compiled once per pattern list and shared
+        self._sensitive_regexes: tuple[re.Pattern, ...] = ()
+        self._sensitive_prescreen: Optional[re.Pattern] = None
         if self.settings.filter_sensitive_data:
-            self._compile_sensitive_patterns()
-    
-    def _compile_sensitive_patterns(self) -> None:
-        """
-        Compile regex patterns for sensitive data detection.
-        
-        Called once during initialization to avoid repeated compilation.
-        Handles invalid patterns gracefully.
-        """
-        for pattern in self.settings.sensitive_patterns:
-            try:
-                # Use IGNORECASE for most patterns to catch variations
-                compiled = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
-                self._compiled_sensitive_patterns.append(compiled)
-            except re.error as e:
-                # Log but don't crash - one bad pattern shouldn't break everything
-                # In production, this should go to a proper logging system
-                print(f"WARNING: Invalid sensitive pattern '{pattern}': {e}")
+            self._sensitive_regexes = self.settings.sensitive_regexes
+            self._sensitive_prescreen = self.settings.sensitive_prescreen
+        self._blocked_regex: Optional[re.Pattern] = self.settings.blocked_regex
+        # Blocked sequences are plain literals, so `in` checks (which run
+        # far faster than the regex engine) can rule out a match first
+        self._blocked_literals = tuple(s for s in self.settings.blocked_sequences if s)
     
     def sanitize_content(
         self, 
@@ -201,6 +236,32 @@ class MemorySafetyGuard:
             redacted_count=redacted_count
         )
     
+    def sanitize_many(
+        self,
+        contents: list[str],
+        max_length: Optional[int] = None
+    ) -> list[SanitizationResult]:
+        """
+        Sanitize a batch of contents, scanning each distinct text once.
+        
+        Batches written together (e.g. a turn's tool patterns) often repeat
+        the same text; duplicates share one result. Each distinct text is
+        checked on its own: a prescreen over the joined batch can miss
+        patterns anchored to an item's start or end.
+        
+        Args:
+            contents: Raw contents to sanitize
+            max_length: Override default max length. None uses settings.
+            
+        Returns:
+            One SanitizationResult per input, in order
+        """
+        results = {
+            content: self.sanitize_content(content, max_length)
+            for content in dict.fromkeys(contents)
+        }
+        return [results[content] for content in contents]
+    
     def _redact_sensitive_data(self, content: str) -> tuple[str, int]:
         """
         Remove sensitive data like API keys, passwords, tokens.
@@ -214,15 +275,22 @@ class MemorySafetyGuard:
         Returns:
             Tuple of (sanitized content, number of redactions made)
         """
+        if not self._sensitive_regexes:
+            return content, 0
+        
+        # Fast path: most content matches no pattern, and one search over
+        # the fused prescreen is cheaper than a subn per pattern
+        prescreen = self._sensitive_prescreen
+        if prescreen is not None and prescreen.search(content) is None:
+            return content, 0
+        
+        # Each pattern runs over the previous one's output, so secrets whose
+        # matches overlap (e.g. a password inside a connection string) are
+        # all redacted
         redaction_count = 0
-        
-        for pattern in self._compiled_sensitive_patterns:
-            # Count matches before replacing
-            matches = pattern.findall(content)
-            if matches:
-                redaction_count += len(matches)
-                content = pattern.sub(self.REDACTION_MARKER, content)
-        
+        for regex in self._sensitive_regexes:
+            content, count = regex.subn(self.REDACTION_MARKER, content)
+            redaction_count += count
         return content, redaction_count
     
     def _escape_injection_sequences(self, content: str) -> tuple[str, bool]:
@@ -244,31 +312,31 @@ class MemorySafetyGuard:
         Returns:
             Tuple of (escaped content, whether any escaping was done)
         """
+        # Fast path: an escaped sequence contains the raw one, so content
+        # without any raw literal has nothing to escape or preserve
+        if self._blocked_regex is None or not self._has_blocked_literal(content):
+            return content, False
+        
         escaped = False
         
-        for sequence in self.settings.blocked_sequences:
-            safe_version = f"[{sequence}]"
-            
-            # Skip if already escaped (don't double-escape)
-            # We temporarily replace already-escaped versions with a placeholder,
-            # then escape the raw ones, then restore the placeholders
-            placeholder = f"\x00ESCAPED_{hash(sequence)}\x00"
-            
-            # Step 1: Protect already-escaped sequences
-            content_with_placeholders = content.replace(safe_version, placeholder)
-            
-            # Step 2: Escape any remaining raw sequences
-            if sequence in content_with_placeholders:
-                content_with_placeholders = content_with_placeholders.replace(
-                    sequence, safe_version
-                )
-                escaped = True
-            
-            # Step 3: Restore the already-escaped sequences
-            content = content_with_placeholders.replace(placeholder, safe_version)
+        def escape(match: re.Match) -> str:
+            nonlocal escaped
+            raw = match.group("raw")
+            # Already-escaped sequences match without the raw group; keep them
+            if raw is None:
+                return match.group()
+            escaped = True
+            return f"[{raw}]"
+        
+        # A single scan finds every sequence, raw or escaped
+        content = self._blocked_regex.sub(escape, content)
         
         return content, escaped
     
+    def _has_blocked_literal(self, content: str) -> bool:
+        """Check whether any blocked sequence occurs in content."""
+        return any(literal in content for literal in self._blocked_literals)
+    
     def _truncate_safely(self, content: str, max_length: int) -> str:
         """
         Truncate content to max length with a clear marker.
@@ -289,20 +357,20 @@ class MemorySafetyGuard:
         if effective_max <= 0:
             return truncation_indicator
         
-        # Try to find a word boundary (space, newline) near the cut point
-        truncated = content[:effective_max]
+        # Try to find a word boundary (space, newline) near the cut point.
+        # Search content in place so only the final slice copies it.
+        window_start = max(0, effective_max - 100)
         
         # Look for last whitespace in final 100 chars
-        last_space = truncated.rfind(' ', max(0, effective_max - 100))
-        last_newline = truncated.rfind('\n', max(0, effective_max - 100))
+        last_space = content.rfind(' ', window_start, effective_max)
+        last_newline = content.rfind('\n', window_start, effective_max)
         
         # Use whichever is closer to the end (but still exists)
         best_break = max(last_space, last_newline)
         
-        if best_break > effective_max - 100:
-            truncated = truncated[:best_break]
-        
-        return truncated + truncation_indicator
+        # With limits under 100 the window check alone would accept -1 (no break)
+        cut = best_break if best_break >= 0 and best_break > effective_max - 100 else effective_max
+        return content[:cut] + truncation_indicator
     
     def validate_path(
         self, 
@@ -335,40 +403,12 @@ class MemorySafetyGuard:
                 error_message=""
             )
         
-        try:
-            # Get absolute path of working directory
-            working_dir_abs = os.path.abspath(working_directory)
-            
-            # Normalize the target path (resolves ../, ./, etc.)
-            # Join with working dir first to handle relative paths
-            target_path = os.path.normpath(os.path.join(working_dir_abs, file_path))
-            
-            # THE CRITICAL CHECK: Is target within working directory?
-            # os.path.commonpath() returns the longest common path prefix
-            # If it equals working_dir_abs, target is inside working directory
-            common = os.path.commonpath([working_dir_abs, target_path])
-            is_valid = common == working_dir_abs
-            
-            if is_valid:
-                return PathValidationResult(
-                    is_safe=True,
-                    normalized_path=target_path,
-                    error_message=""
-                )
-            else:
-                return PathValidationResult(
-                    is_safe=False,
-                    normalized_path="",
-                    error_message=f'Path "{file_path}" escapes the permitted working directory'
-                )
-                
-        except (ValueError, OSError) as e:
-            # Handle edge cases like paths on different drives (Windows)
-            return PathValidationResult(
-                is_safe=False,
-                normalized_path="",
-                error_message=f'Invalid path "{file_path}": {e}'
-            )
+        is_safe, normalized_path, error_message = _check_path(file_path, working_directory)
+        return PathValidationResult(
+            is_safe=is_safe,
+            normalized_path=normalized_path,
+            error_message=error_message
+        )
     
     def is_path_safe(self, file_path: str, working_directory: str) -> bool:
         """
@@ -395,9 +435,10 @@ class MemorySafetyGuard:
             value: Value to hash
             
         Returns:
-            First 16 chars of SHA256 hex digest (64-bit entropy)
+            16-char hex BLAKE2b digest (64-bit entropy)
         """
-        return hashlib.sha256(value.encode('utf-8')).hexdigest()[:16]
+        # digest_size=8 yields exactly the 64 bits we keep; no slicing needed
+        return hashlib.blake2b(value.encode('utf-8'), digest_size=8).hexdigest()
 
 
 # Convenience function for quick sanitization without creating an instance
@@ -405,8 +446,8 @@ def sanitize(content: str, settings: Optional[SafetySettings] = None) -> str:
     """
     Quick sanitization of content.
     
-    Creates a temporary guard and sanitizes content.
-    For repeated use, create a MemorySafetyGuard instance instead.
+    Calls without settings share one default guard; custom settings get
+    a temporary guard. For repeated use, create a MemorySafetyGuard instance.
     
     Args:
         content: Content to sanitize
@@ -415,5 +456,11 @@ def sanitize(content: str, settings: Optional[SafetySettings] = None) -> str:
     Returns:
         Sanitized content string
     """
-    guard = MemorySafetyGuard(settings)
-    return guard.sanitize_content(content).content
\ No newline at end of file
+    guard = MemorySafetyGuard(settings) if settings is not None else _default_guard()
+    return guard.sanitize_content(content).content
+
+
+@lru_cache(maxsize=1)
+def _default_guard() -> MemorySafetyGuard:
+    # Its SafetySettings are private to it, so nothing can change them later
+    return MemorySafetyGuard()
\ No newline at end of file
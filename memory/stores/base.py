@@ -24,11 +24,10 @@ Example:
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
-from datetime import datetime
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
 from memory.models import Memory, User, Project, MemoryQuery
-from memory.config import MemoryType, MemoryScope
 
 
 class MemoryStoreError(Exception):
@@ -123,6 +122,21 @@ class MemoryStore(ABC):
         """Context manager exit - close the store."""
         self.close()
     
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group the writes made inside the block into one transaction.
+        
+        Backends with transactions should override this so the block
+        commits once. The default implementation adds no grouping.
+        
+        Example:
+            with store.transaction():
+                store.store_user(user)
+                store.store_project(project)
+        """
+        yield
+    
     # =========================================================================
     # Memory CRUD Operations
     # =========================================================================
@@ -305,10 +319,100 @@ class MemoryStore(ABC):
         """
         pass
     
+    def get_user_and_project(
+        self, name: Optional[str], absolute_path: Optional[str]
+    ) -> tuple[Optional[User], Optional[Project]]:
+        """
+        Look up a user by name and a project by path together.
+        
+        Used to bootstrap a session. Backends that can answer both in one
+        round-trip should override this; the default implementation does
+        the two lookups separately.
+        
+        Args:
+            name: The user's display name, or None to skip the user
+            absolute_path: The project's absolute path, or None to skip it
+            
+        Returns:
+            (user, project), each None if not requested or not found
+        """
+        user = self.get_user_by_name(name) if name else None
+        project = self.get_project_by_path(absolute_path) if absolute_path else None
+        return user, project
+    
+    def upsert_user_by_name(self, name: str) -> User:
+        """
+        Return the user with this name, creating them if they don't exist.
+        
+        Backends that can do this atomically should override it; the
+        default implementation looks the user up and stores a new one on
+        a miss, which can race with concurrent callers.
+        
+        Args:
+            name: The user's display name
+            
+        Returns:
+            The existing or newly created user
+        """
+        existing = self.get_user_by_name(name)
+        if existing:
+            return existing
+        return self.store_user(User.create(name))
+    
+    def upsert_project_by_path_hash(self, project: Project) -> Project:
+        """
+        Return the stored project with this project's path_hash, storing
+        the given project if there is none yet.
+        
+        Backends that can do this atomically should override it; the
+        default implementation looks the project up first.
+        
+        Args:
+            project: A new project, e.g. from Project.from_path()
+            
+        Returns:
+            The existing or newly stored project
+        """
+        existing = self.get_project_by_path(project.last_known_path)
+        if existing:
+            return existing
+        return self.store_project(project)
+    
     # =========================================================================
     # Bulk Operations
     # =========================================================================
     
+    def store_many(self, memories: list[Memory]) -> list[Memory]:
+        """
+        Store several memories at once.
+        
+        Backends that support transactions should override this to write
+        all memories in a single transaction. The default implementation
+        simply stores them one by one.
+        
+        Args:
+            memories: The memories to store (should already be sanitized!)
+            
+        Returns:
+            The stored memories, in the same order
+        """
+        return [self.store(memory) for memory in memories]
+    
+    def query_many(self, queries: list[MemoryQuery]) -> list[list[Memory]]:
+        """
+        Run several queries at once.
+        
+        Backends that can combine queries into a single round-trip should
+        override this. The default implementation runs them one by one.
+        
+        Args:
+            queries: The queries to run
+            
+        Returns:
+            One result list per query, in the same order
+        """
+        return [self.query(query) for query in queries]
+    
     def clear(self) -> int:
         """
         Delete ALL memories from the store.
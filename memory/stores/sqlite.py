@@ -1,19 +1,150 @@
-import hashlib
+import queue
 import sqlite3
 import json
-from typing import Collection, List, Optional, Any, Tuple, Dict
+import os
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import attrgetter
+from sys import intern
+from typing import Callable, Iterator, List, Optional, Any, Tuple, Dict
 from datetime import datetime, timezone
 
 from memory.stores.base import MemoryStore
-from memory.models import Memory, User, Project, MemoryQuery
-from memory.config import MemoryConfig, MemoryScope, MemoryType, RetentionPolicy
+from memory.models import (
+    Memory, User, Project, MemoryQuery, hash_project_path, legacy_project_path_hash,
+)
+from memory.config import (
+    MemoryConfig, MemoryScope, MemoryType, RetentionPolicy, parse_enum,
+    MEMORY_SCOPE_BY_VALUE, MEMORY_TYPE_BY_VALUE, RETENTION_POLICY_BY_VALUE,
+    SQLITE_JOURNAL_MODES, SQLITE_SYNCHRONOUS_MODES,
+)
+
+
+_INSERT_MEMORY_SQL = """
+    INSERT OR REPLACE INTO memories 
+    (id, content, scope, memory_type, retention_policy, user_id, project_id, 
+     tags, metadata, created_at, updated_at, expires_at, last_accessed_at, 
+     access_count, importance, source) 
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# The no-op DO UPDATE makes RETURNING yield the existing row on a conflict
+# (DO NOTHING returns no row at all)
+_UPSERT_USER_SQL = """
+    INSERT INTO users (id, display_name, created_at, tags) VALUES (?, ?, ?, ?)
+    ON CONFLICT(display_name) DO UPDATE SET display_name = excluded.display_name
+    RETURNING *
+"""
+
+_UPSERT_PROJECT_SQL = """
+    INSERT INTO projects (id, name, path_hash, last_known_path, created_at, tags)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(path_hash) DO UPDATE SET path_hash = excluded.path_hash
+    RETURNING *
+"""
+
+@lru_cache(maxsize=256)
+def _condition_sql(shape: tuple) -> str:
+    """Build the WHERE clause for a query shape (see SQLiteMemoryStore._query_shape)."""
+    (has_user, project_mode, scope_count, type_count, policy_count,
+     has_after, has_before, include_expired) = shape
+    conditions = []
+
+    if has_user:
+        conditions.append("user_id = ?")
+    if project_mode is not None:
+        if project_mode:
+            conditions.append("(project_id = ? OR project_id IS NULL)")
+        else:
+            conditions.append("project_id = ?")
+    if scope_count:
+        conditions.append(f"scope IN ({', '.join('?' * scope_count)})")
+    if type_count:
+        conditions.append(f"memory_type IN ({', '.join('?' * type_count)})")
+    if policy_count:
+        conditions.append(f"retention_policy IN ({', '.join('?' * policy_count)})")
+
+    # Time-based filters
+    if has_after:
+        conditions.append("created_at > ?")
+    if has_before:
+        conditions.append("created_at < ?")
+    if not include_expired:
+        conditions.append("(expires_at IS NULL OR expires_at > ?)")
+
+    if not conditions:
+        return ""
+    return f" WHERE {' AND '.join(conditions)}"
+
+
+# Same column order as SELECT *, but with metadata (the widest, least-read
+# column) left unread; _row_to_memory decodes the NULL as {}
+_COLUMNS_WITHOUT_METADATA = (
+    "id, content, scope, memory_type, retention_policy, user_id, project_id, "
+    "tags, NULL, created_at, updated_at, expires_at, last_accessed_at, "
+    "access_count, importance, source"
+)
+
+
+@lru_cache(maxsize=256)
+def _select_sql(
+    condition: str, order_by: str, order_desc: bool, has_offset: bool, include_metadata: bool = True
+) -> str:
+    """Build a SELECT over memories; LIMIT and OFFSET are bound as parameters."""
+    columns = "*" if include_metadata else _COLUMNS_WITHOUT_METADATA
+    order_direction = "DESC" if order_desc else "ASC"
+    sql = f"SELECT {columns} FROM memories{condition} ORDER BY {order_by} {order_direction} LIMIT ?"
+    return sql + " OFFSET ?" if has_offset else sql
+
+
+@lru_cache(maxsize=None)
+def _order_key(order_by: str) -> Callable[[Memory], Tuple[bool, Any]]:
+    """Sort key for Memory objects matching ORDER BY on a nullable column:
+    SQLite puts NULLs first ascending (and so last descending)."""
+    get = attrgetter(order_by)
+    
+    def key(memory: Memory) -> Tuple[bool, Any]:
+        value = get(memory)
+        return value is not None, value
+    
+    return key
+
+
+_MIGRATE_PROJECT_HASH_SQL = """
+    UPDATE projects SET path_hash = ?
+    WHERE path_hash = ? AND NOT EXISTS (SELECT 1 FROM projects WHERE path_hash = ?)
+"""
+
+# Databases that exist only inside one connection; these can't be pooled
+_UNPOOLABLE_PATHS = ("", ":memory:")
+
+
+# Bound encode/decode skip json.dumps/loads' per-call keyword handling;
+# compact separators also keep the stored text smaller. Rows written with
+# the default separators still decode the same.
+_encode_json = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+_decode_json = json.JSONDecoder().decode
+
+
+def _dump_json(value: Any, empty: str) -> str:
+    """Encode tags/metadata, skipping the encoder for the (common) empty case."""
+    return _encode_json(value) if value else empty
 
 
 class SQLiteMemoryStore(MemoryStore):
-    def __init__(self, config: MemoryConfig, db_path: str = "memory.db"):
+    def __init__(self, config: MemoryConfig, db_path: "str | os.PathLike[str]" = "memory.db"):
         self.config = config
-        self.db_path = db_path
-        self._conn: Optional[sqlite3.Connection] = None
+        # Kept as a str so ":memory:" checks and every connect() use it as is
+        self.db_path = os.fspath(db_path)
+        self._conn: Optional[sqlite3.Connection] = None  # The single writer
+        self._readers: Optional["queue.Queue[sqlite3.Connection]"] = None
+        # Reentrant so writes inside transaction() can take it again
+        self._write_lock = threading.RLock()
+        self._transaction_depth = 0
+        # False for older databases that already hold duplicate user names,
+        # where the unique index (and so the user UPSERT) isn't available
+        self._unique_user_names = True
 
     @property
     def conn(self) -> sqlite3.Connection:
@@ -25,10 +156,8 @@ class SQLiteMemoryStore(MemoryStore):
         return self._conn
 
     def initialize(self) -> None:
-        """Establish connection and ensure tables exist."""
-        # check_same_thread=False allows using the connection across threads,
-        # which is needed if the agent runs async operations.
-        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        """Establish connections and ensure tables exist."""
+        self._conn = self._connect()
 
         # Use the non-optional property
         self.conn.execute("PRAGMA foreign_keys = ON;")
@@ -36,6 +165,118 @@ class SQLiteMemoryStore(MemoryStore):
         self._create_tables()
         self.conn.commit()
 
+        # Readers are opened after the tables exist so they never see a
+        # half-created schema. Under WAL they read the last committed state
+        # without waiting on the writer.
+        pool_size = self.config.sqlite_pool_size
+        if pool_size > 0 and self.db_path not in _UNPOOLABLE_PATHS:
+            self._readers = queue.Queue()
+            for _ in range(pool_size):
+                reader = self._connect()
+                reader.execute("PRAGMA query_only = ON;")
+                self._readers.put(reader)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a tuned connection to the database file."""
+        # check_same_thread=False allows using the connection across threads,
+        # which is needed if the agent runs async operations.
+        # Queries are built from a small set of cached SQL strings (see
+        # _condition_sql), so a larger statement cache keeps them all compiled.
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            timeout=self.config.sqlite_busy_timeout_ms / 1000,
+            cached_statements=256,
+        )
+        self._apply_pragmas(conn)
+        return conn
+
+    @contextmanager
+    def _read_conn(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a read connection from the pool for the duration of a block.
+        
+        Without a pool (in-memory databases, or sqlite_pool_size = 0) reads
+        share the writer and are serialized with writes.
+        """
+        readers = self._readers
+        if readers is None:
+            with self._write_lock:
+                yield self.conn
+            return
+
+        reader = readers.get()
+        try:
+            yield reader
+        finally:
+            readers.put(reader)
+
+    @contextmanager
+    def _write_conn(self) -> Iterator[sqlite3.Connection]:
+        """Hold the writer for a block, committing (or rolling back) at the end."""
+        with self._write_lock:
+            conn = self.conn
+            if self._transaction_depth:
+                # Part of an enclosing transaction(), which commits
+                yield conn
+                return
+            with conn:
+                yield conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group several writes into one transaction (and one commit).
+        
+        Takes the write lock for the whole block with BEGIN IMMEDIATE.
+        Nested blocks join the outermost one. Reads through the pool don't
+        see the block's writes until it commits.
+        """
+        with self._write_lock:
+            if self._transaction_depth:
+                self._transaction_depth += 1
+                try:
+                    yield
+                finally:
+                    self._transaction_depth -= 1
+                return
+
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            self._transaction_depth = 1
+            try:
+                yield
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+            finally:
+                self._transaction_depth = 0
+
+    def _apply_pragmas(self, conn: sqlite3.Connection) -> None:
+        """
+        Apply the connection tuning from MemoryConfig.
+
+        PRAGMA values can't be bound as parameters, so the mode names are
+        checked against the known values before being interpolated.
+        """
+        config = self.config
+        journal_mode = config.sqlite_journal_mode.upper()
+        synchronous = config.sqlite_synchronous.upper()
+        if journal_mode not in SQLITE_JOURNAL_MODES:
+            raise ValueError(f"Unknown sqlite_journal_mode: {config.sqlite_journal_mode}")
+        if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+            raise ValueError(f"Unknown sqlite_synchronous: {config.sqlite_synchronous}")
+
+        conn.execute(f"PRAGMA journal_mode = {journal_mode};")
+        conn.execute(f"PRAGMA synchronous = {synchronous};")
+        # Negative cache_size is in KiB rather than pages
+        conn.execute(f"PRAGMA cache_size = {-int(config.sqlite_cache_size_kb)};")
+        conn.execute(f"PRAGMA mmap_size = {int(config.sqlite_mmap_size)};")
+        conn.execute("PRAGMA temp_store = MEMORY;")
+        conn.execute(f"PRAGMA wal_autocheckpoint = {int(config.sqlite_wal_autocheckpoint)};")
+
     def _create_tables(self) -> None:
         # Narrow once into a local non-optional variable
         conn = self.conn
@@ -97,61 +338,76 @@ class SQLiteMemoryStore(MemoryStore):
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_memories_type ON memories(memory_type);"
             )
+            # Covers the per-user history/corrections lookups, newest first
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_memories_user_project_type_created "
+                "ON memories(user_id, project_id, memory_type, created_at DESC);"
+            )
+            # Preferences and corrections filter by user and type only
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_memories_user_type_created "
+                "ON memories(user_id, memory_type, created_at DESC);"
+            )
+
+        # Give the planner statistics to choose between the indexes. Only
+        # done once per database; close() keeps them current via optimize.
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        if not has_stats:
+            conn.execute("ANALYZE;")
+
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_display_name ON users(display_name);"
+                )
+        except sqlite3.IntegrityError:
+            self._unique_user_names = False
+
+    @staticmethod
+    def _query_shape(query: MemoryQuery) -> tuple:
+        """Everything about a query that affects its SQL text, but not its parameter values."""
+        return (
+            bool(query.user_id),
+            query.include_no_project if query.project_id else None,
+            len(query.scopes) if query.scopes else 0,
+            len(query.memory_types) if query.memory_types else 0,
+            len(query.retention_policies) if query.retention_policies else 0,
+            bool(query.created_after),
+            bool(query.created_before),
+            query.include_expired,
+        )
 
     def _build_query_conditions(self, query: MemoryQuery) -> Tuple[str, List[Any]]:
-        conditions = []
-        params = []
+        """
+        Return the WHERE clause and its parameters for a query.
+        
+        The clause text depends only on the query's shape and is cached, so
+        queries of the same shape reuse one SQL string (and so one compiled
+        statement in the connection's statement cache).
+        """
+        params: List[Any] = []
 
         if query.user_id:
-            conditions.append("user_id = ?")  # The Rule
-            params.append(query.user_id)      # The Data
-            
+            params.append(query.user_id)
         if query.project_id:
-            if query.include_no_project:
-                conditions.append("(project_id = ? OR project_id IS NULL)")
-                params.append(query.project_id)
-            else:
-                conditions.append("project_id = ?")
-                params.append(query.project_id)
-            
+            params.append(query.project_id)
         if query.scopes:
-            placeholders = self._build_query_conditions_string(query.scopes)
-            conditions.append(f"scope IN ({placeholders})")
             params.extend([scope.value for scope in query.scopes])
-            
         if query.memory_types:
-            placeholders = self._build_query_conditions_string(query.memory_types)
-            conditions.append(f"memory_type IN ({placeholders})")
             params.extend([memory_type.value for memory_type in query.memory_types])
-            
         if query.retention_policies:
-            placeholders = self._build_query_conditions_string(query.retention_policies)
-            conditions.append(f"retention_policy IN ({placeholders})")
             params.extend([policy.value for policy in query.retention_policies])
-
-        # Add time-based filters
         if query.created_after:
-            conditions.append("created_at > ?")
             params.append(query.created_after.isoformat())
-            
         if query.created_before:
-            conditions.append("created_at < ?")
             params.append(query.created_before.isoformat())
-            
-        # Handle expired filter
         if not query.include_expired:
-            conditions.append("(expires_at IS NULL OR expires_at > ?)")
             params.append(datetime.now().isoformat())
 
-        if not conditions:
-            return "", []
-        
-        return f" WHERE {' AND '.join(conditions)}", params
+        return _condition_sql(self._query_shape(query)), params
 
-    def _build_query_conditions_string(self, query: List[Any]) -> str:
-        """Fixed: Create proper SQL placeholder string with parentheses for IN clauses."""
-        return ", ".join(["?" for _ in query])
-    
     def _row_to_memory(self, row: Tuple) -> Memory:
         # Updated to handle all fields including the new ones
         (mem_id, content, scope_val, type_val, policy_val, 
@@ -159,108 +415,130 @@ class SQLiteMemoryStore(MemoryStore):
          created_at, updated_at, expires_at, last_accessed, access_count,
          importance, source) = row
 
-        scope_val = MemoryScope(scope_val)
-        type_val = MemoryType(type_val)
-        policy_val = RetentionPolicy(policy_val)
-
-        if tags_json:
-            tags = json.loads(tags_json)
-        else:
-            tags = []  # Handle None
+        scope_val = MEMORY_SCOPE_BY_VALUE.get(scope_val) or parse_enum(MemoryScope, scope_val)
+        type_val = MEMORY_TYPE_BY_VALUE.get(type_val) or parse_enum(MemoryType, type_val)
+        policy_val = (RETENTION_POLICY_BY_VALUE.get(policy_val)
+                      or parse_enum(RetentionPolicy, policy_val))
 
-        if metadata_json:
-            metadata = json.loads(metadata_json)
-        else:
-            metadata = {}
+        # Handle None and the common empty encodings without calling json
+        # Tags and sources repeat across rows, so share one string per value
+        tags = [intern(tag) for tag in _decode_json(tags_json) or []] if tags_json and tags_json != "[]" else []
+        metadata = _decode_json(metadata_json) if metadata_json and metadata_json != "{}" else {}
         
-        created_at = datetime.fromisoformat(created_at)
-        updated_at = datetime.fromisoformat(updated_at)
+        fromisoformat = datetime.fromisoformat
+        created_at = fromisoformat(created_at)
+        updated_at = fromisoformat(updated_at)
         
         if expires_at:
-            expires_at = datetime.fromisoformat(expires_at)
+            expires_at = fromisoformat(expires_at)
             
         if last_accessed:
-            last_accessed = datetime.fromisoformat(last_accessed)
+            last_accessed = fromisoformat(last_accessed)
             
-        return Memory(
-            id=mem_id, content=content, memory_type=type_val, scope=scope_val, 
-            retention_policy=policy_val, user_id=user_id, project_id=project_id, 
-            created_at=created_at, updated_at=updated_at, expires_at=expires_at, 
-            access_count=access_count, last_accessed_at=last_accessed, tags=tags, 
-            metadata=metadata, importance=importance, source=source
+        # Positional, in Memory's field order: keyword binding of 16 fields
+        # costs about as much as the rest of this method. Rows were validated
+        # when stored, so skip re-validating them.
+        return Memory._unchecked(
+            mem_id, content, type_val, scope_val, policy_val, user_id, project_id,
+            created_at, updated_at, expires_at, importance, access_count,
+            last_accessed, tags, intern(source) if source is not None else "unknown", metadata
         )
 
     def get(self, memory_id: str) -> Optional[Memory]:
         query = "SELECT * FROM memories WHERE id = ?"
-        row = self.conn.execute(query, (memory_id,)).fetchone()
+        with self._read_conn() as conn:
+            row = conn.execute(query, (memory_id,)).fetchone()
         
         if not row:
             return None
         else:
             return self._row_to_memory(row)
         
-    def store(self, memory: Memory) -> Memory:
-        # 1. Unpack and Convert Data
-        mem_id = memory.id
-        content = memory.content
-        user_id = memory.user_id
-        project_id = memory.project_id
-        access_count = memory.access_count
-
-        # Convert Enums to their string values
-        scope = memory.scope.value
-        memory_type = memory.memory_type.value
-        retention_policy = memory.retention_policy.value
-
-        # Serialize list/dict to JSON strings
-        tags = json.dumps(memory.tags)
-        metadata = json.dumps(memory.metadata)
-
-        # Convert datetimes to ISO strings
-        created_at = memory.created_at.isoformat()
-        updated_at = memory.updated_at.isoformat()
-        
-        # Handle optional datetimes
+    def _memory_to_row(self, memory: Memory) -> Tuple:
+        """Convert a Memory into a row tuple matching _INSERT_MEMORY_SQL."""
+        # Convert datetimes to ISO strings, handling optional ones
         expires_at = memory.expires_at.isoformat() if memory.expires_at else None
         last_accessed_at = memory.last_accessed_at.isoformat() if memory.last_accessed_at else None
 
-        # 2. Execute the INSERT - Added missing fields
-        query = """
-            INSERT OR REPLACE INTO memories 
-            (id, content, scope, memory_type, retention_policy, user_id, project_id, 
-             tags, metadata, created_at, updated_at, expires_at, last_accessed_at, 
-             access_count, importance, source) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        
-        values = (
-            mem_id, content, scope, memory_type, retention_policy, user_id, project_id, 
-            tags, metadata, created_at, updated_at, expires_at, last_accessed_at, 
-            access_count, memory.importance, memory.source
+        return (
+            memory.id, memory.content, memory.scope.value, memory.memory_type.value,
+            memory.retention_policy.value, memory.user_id, memory.project_id,
+            _dump_json(memory.tags, "[]"), _dump_json(memory.metadata, "{}"),
+            memory.created_at.isoformat(), memory.updated_at.isoformat(),
+            expires_at, last_accessed_at,
+            memory.access_count, memory.importance, memory.source
         )
 
-        with self.conn:
-            self.conn.execute(query, values)
+    def store(self, memory: Memory) -> Memory:
+        row = self._memory_to_row(memory)
+        with self._write_conn() as conn:
+            conn.execute(_INSERT_MEMORY_SQL, row)
         
         return memory
     
-    def query(self, query: MemoryQuery) -> List[Memory]:
-        base_query = "SELECT * FROM memories"
-        condition, params = self._build_query_conditions(query)
+    def store_many(self, memories: List[Memory]) -> List[Memory]:
+        """
+        Store several memories in a single transaction.
+        Returns: The stored memories, in the same order
+        """
+        if not memories:
+            return []
         
-        # Add ordering
-        order_direction = "DESC" if query.order_desc else "ASC"
-        order_clause = f" ORDER BY {query.order_by} {order_direction}"
+        rows = [self._memory_to_row(m) for m in memories]
+        with self._write_conn() as conn:
+            conn.executemany(_INSERT_MEMORY_SQL, rows)
         
-        # Add limit and offset
-        limit_clause = f" LIMIT {query.limit}"
+        return list(memories)
+    
+    def _build_select(self, query: MemoryQuery) -> Tuple[str, List[Any]]:
+        """Build the SELECT statement and parameters for a single query."""
+        condition, params = self._build_query_conditions(query)
+        params.append(query.limit)
         if query.offset > 0:
-            limit_clause += f" OFFSET {query.offset}"
+            params.append(query.offset)
         
-        final_query = base_query + condition + order_clause + limit_clause
-        rows = self.conn.execute(final_query, params).fetchall()
+        sql = _select_sql(
+            condition, query.order_by, query.order_desc, query.offset > 0, query.include_metadata
+        )
+        return sql, params
+
+    def query(self, query: MemoryQuery) -> List[Memory]:
+        final_query, params = self._build_select(query)
+        with self._read_conn() as conn:
+            rows = conn.execute(final_query, params).fetchall()
         
         return [self._row_to_memory(row) for row in rows]
+
+    def query_many(self, queries: List[MemoryQuery]) -> List[List[Memory]]:
+        """
+        Run several queries as one UNION ALL statement.
+        
+        Each sub-select is tagged with its position so rows can be split
+        back into per-query results.
+        """
+        if len(queries) <= 1:
+            return [self.query(query) for query in queries]
+        
+        selects = []
+        params: List[Any] = []
+        for index, query in enumerate(queries):
+            sub_query, sub_params = self._build_select(query)
+            selects.append(f"SELECT {index}, * FROM ({sub_query})")
+            params.extend(sub_params)
+        
+        with self._read_conn() as conn:
+            rows = conn.execute(" UNION ALL ".join(selects), params).fetchall()
+        
+        results: List[List[Memory]] = [[] for _ in queries]
+        for row in rows:
+            results[row[0]].append(self._row_to_memory(row[1:]))
+        
+        # A compound SELECT doesn't guarantee row order across its parts,
+        # so restore each query's requested ordering
+        for query, memories in zip(queries, results):
+            memories.sort(key=_order_key(query.order_by), reverse=query.order_desc)
+        
+        return results
     
     def delete(self, memory_id: str) -> bool:
         """
@@ -269,8 +547,8 @@ class SQLiteMemoryStore(MemoryStore):
         """
         query = "DELETE FROM memories WHERE id = ?"
         
-        with self.conn:
-            cursor = self.conn.execute(query, (memory_id,))
+        with self._write_conn() as conn:
+            cursor = conn.execute(query, (memory_id,))
         
         return cursor.rowcount > 0
         
@@ -278,7 +556,13 @@ class SQLiteMemoryStore(MemoryStore):
         """
         Clean up resources and close connections.
         """
+        if self._readers is not None:
+            while not self._readers.empty():
+                self._readers.get_nowait().close()
+            self._readers = None
+        
         if self._conn:
+            self._conn.execute("PRAGMA optimize;")
             self._conn.close()
             self._conn = None
         
@@ -289,24 +573,41 @@ class SQLiteMemoryStore(MemoryStore):
         """
         user_id = user.id
         user_name = user.name
-        created_at = user.created_at.isoformat()
-        tags = json.dumps(user.tags)
+        created_at = user.created_at_iso
+        tags = _dump_json(user.tags, "[]")
         
         query = "INSERT OR REPLACE INTO users (id, display_name, created_at, tags) VALUES (?, ?, ?, ?)"
         values = (user_id, user_name, created_at, tags)
         
-        with self.conn:
-            self.conn.execute(query, values)
+        with self._write_conn() as conn:
+            conn.execute(query, values)
         
         return user
 
+    def upsert_user_by_name(self, name: str) -> User:
+        """
+        Atomically get the user with this name or create them.
+        Returns: The existing or newly created user
+        """
+        if not self._unique_user_names:
+            return super().upsert_user_by_name(name)
+        
+        user = User.create(name)
+        values = (user.id, user.name, user.created_at_iso, _dump_json(user.tags, "[]"))
+        
+        with self._write_conn() as conn:
+            row = conn.execute(_UPSERT_USER_SQL, values).fetchone()
+        
+        return self._row_to_user(row)
+
     def get_user(self, user_id: str) -> Optional[User]:
         """
         Retrieve a user by their ID.
         Returns: The user object if found, None otherwise
         """
         query = "SELECT * FROM users WHERE id = ?"
-        row = self.conn.execute(query, (user_id,)).fetchone()
+        with self._read_conn() as conn:
+            row = conn.execute(query, (user_id,)).fetchone()
         
         if not row:
             return None
@@ -319,7 +620,8 @@ class SQLiteMemoryStore(MemoryStore):
         Returns: The user object if found, None otherwise
         """
         query = "SELECT * FROM users WHERE display_name = ?"
-        row = self.conn.execute(query, (name,)).fetchone()
+        with self._read_conn() as conn:
+            row = conn.execute(query, (name,)).fetchone()
         
         if not row:
             return None
@@ -333,7 +635,7 @@ class SQLiteMemoryStore(MemoryStore):
         """
         user_id, user_name, created_at, tags_json = row
         created_at = datetime.fromisoformat(created_at)
-        tags = json.loads(tags_json) if tags_json else []
+        tags = _decode_json(tags_json) if tags_json and tags_json != "[]" else []
         
         return User(id=user_id, name=user_name, created_at=created_at, tags=tags)
 
@@ -346,38 +648,89 @@ class SQLiteMemoryStore(MemoryStore):
         project_name = project.name
         path_hash = project.path_hash
         last_known_path = project.last_known_path
-        created_at = project.created_at.isoformat()
-        tags = json.dumps(project.tags)
+        created_at = project.created_at_iso
+        tags = _dump_json(project.tags, "[]")
         
         query = "INSERT OR REPLACE INTO projects (id, name, path_hash, last_known_path, created_at, tags) VALUES (?, ?, ?, ?, ?, ?)"
         values = (project_id, project_name, path_hash, last_known_path, created_at, tags)
         
-        with self.conn:
-            self.conn.execute(query, values)
+        with self._write_conn() as conn:
+            conn.execute(query, values)
         
         return project
 
+    def upsert_project_by_path_hash(self, project: Project) -> Project:
+        """
+        Atomically get the project with this project's path_hash, or store it.
+        A project stored under the legacy SHA256 hash of the same path is
+        rehashed in place, keeping its id (and so its memories).
+        Returns: The existing or newly stored project
+        """
+        legacy_hash = legacy_project_path_hash(project.last_known_path)
+        values = (
+            project.id, project.name, project.path_hash, project.last_known_path,
+            project.created_at_iso, _dump_json(project.tags, "[]"),
+        )
+        
+        with self._write_conn() as conn:
+            if legacy_hash != project.path_hash:
+                conn.execute(_MIGRATE_PROJECT_HASH_SQL, (project.path_hash, legacy_hash, project.path_hash))
+            row = conn.execute(_UPSERT_PROJECT_SQL, values).fetchone()
+        
+        return self._row_to_project(row)
+
     def get_project(self, project_id: str) -> Optional[Project]:
         """
         Retrieve a project by its ID.
         Returns: The project object if found, None otherwise
         """
         query = "SELECT * FROM projects WHERE id = ?"
-        row = self.conn.execute(query, (project_id,)).fetchone()
+        with self._read_conn() as conn:
+            row = conn.execute(query, (project_id,)).fetchone()
         
         if not row:
             return None
         else:
             return self._row_to_project(row)
     
+    def get_user_and_project(
+        self, name: Optional[str], absolute_path: Optional[str]
+    ) -> Tuple[Optional[User], Optional[Project]]:
+        """
+        Look up a user by name and a project by path in one statement.
+        Returns: (user, project), each None if not requested or not found
+        """
+        # Both sides are LEFT JOINed onto a single row, so a missing one
+        # comes back as NULLs. A NULL name or hash matches nothing.
+        path_hash = hash_project_path(absolute_path) if absolute_path else None
+        query = """
+            SELECT u.*, p.* FROM (SELECT 1)
+            LEFT JOIN users u ON u.display_name = ?
+            LEFT JOIN projects p ON p.path_hash = ?
+            LIMIT 1
+        """
+        with self._read_conn() as conn:
+            row = conn.execute(query, (name, path_hash)).fetchone()
+        
+        user = self._row_to_user(row[:4]) if row[0] is not None else None
+        project = self._row_to_project(row[4:]) if row[4] is not None else None
+        
+        # Projects stored under the legacy SHA256 hash need the slower lookup
+        if project is None and absolute_path:
+            project = self.get_project_by_path(absolute_path)
+        return user, project
+
     def get_project_by_path(self, absolute_path: str) -> Optional[Project]:
         """
         Retrieve a project by its absolute file path.
         Returns: The project object if found, None otherwise
         """
-        path_hash = hashlib.sha256(absolute_path.encode()).hexdigest()
         query = "SELECT * FROM projects WHERE path_hash = ?"
-        row = self.conn.execute(query, (path_hash,)).fetchone()
+        with self._read_conn() as conn:
+            row = conn.execute(query, (hash_project_path(absolute_path),)).fetchone()
+            if not row:
+                # Projects stored before the switch to BLAKE2b
+                row = conn.execute(query, (legacy_project_path_hash(absolute_path),)).fetchone()
         
         if not row:
             return None
@@ -392,7 +745,7 @@ class SQLiteMemoryStore(MemoryStore):
         # Fixed: Match the actual column order from CREATE TABLE
         project_id, path_hash, project_name, last_known_path, created_at, tags_json = row
         created_at = datetime.fromisoformat(created_at)
-        tags = json.loads(tags_json) if tags_json else []
+        tags = _decode_json(tags_json) if tags_json and tags_json != "[]" else []
         
         return Project(id=project_id, name=project_name, path_hash=path_hash, last_known_path=last_known_path, created_at=created_at, tags=tags)
     
@@ -405,11 +758,13 @@ class SQLiteMemoryStore(MemoryStore):
         base_query = "SELECT COUNT(*) FROM memories"
         
         if not query:
-            return self.conn.execute(base_query).fetchone()[0]
+            final_query, params = base_query, []
         else:
             sql_query, params = self._build_query_conditions(query)
             final_query = base_query + sql_query
-            return self.conn.execute(final_query, params).fetchone()[0]
+        
+        with self._read_conn() as conn:
+            return conn.execute(final_query, params).fetchone()[0]
             
     def delete_by_query(self, query: MemoryQuery) -> int:
         """Delete memories matching a query using the same condition builder."""
@@ -418,8 +773,8 @@ class SQLiteMemoryStore(MemoryStore):
         
         final_query = base_query + condition
         
-        with self.conn:
-            cursor = self.conn.execute(final_query, params)
+        with self._write_conn() as conn:
+            cursor = conn.execute(final_query, params)
         
         return cursor.rowcount
     
@@ -428,8 +783,8 @@ class SQLiteMemoryStore(MemoryStore):
         query = "DELETE FROM memories WHERE expires_at IS NOT NULL AND expires_at < ?"
         curr_time = datetime.now(timezone.utc)
         
-        with self.conn:
-            cursor = self.conn.execute(query, (curr_time.isoformat(),))
+        with self._write_conn() as conn:
+            cursor = conn.execute(query, (curr_time.isoformat(),))
         
         return cursor.rowcount
     
@@ -458,8 +813,9 @@ class SQLiteMemoryStore(MemoryStore):
         
         # Oldest and newest memories
         try:
-            oldest = self.conn.execute("SELECT MIN(created_at) FROM memories").fetchone()[0]
-            newest = self.conn.execute("SELECT MAX(created_at) FROM memories").fetchone()[0]
+            with self._read_conn() as conn:
+                oldest = conn.execute("SELECT MIN(created_at) FROM memories").fetchone()[0]
+                newest = conn.execute("SELECT MAX(created_at) FROM memories").fetchone()[0]
             
             if oldest:
                 stats["oldest_memory"] = datetime.fromisoformat(oldest)
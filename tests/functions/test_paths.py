@@ -0,0 +1,25 @@
+import os
+
+from functions.paths import resolve_working_directory, is_within_directory
+
+
+def test_resolve_working_directory_is_absolute():
+    result = resolve_working_directory("calculator")
+    assert result == os.path.abspath("calculator")
+
+
+def test_is_within_directory_nested_path():
+    working_dir_abs = resolve_working_directory("calculator")
+    assert is_within_directory(os.path.join(working_dir_abs, "pkg"), working_dir_abs)
+    assert is_within_directory(working_dir_abs, working_dir_abs)
+
+
+def test_is_within_directory_sibling_prefix_blocked():
+    working_dir_abs = resolve_working_directory("calculator")
+    assert not is_within_directory(working_dir_abs + "_evil", working_dir_abs)
+    assert not is_within_directory(os.path.dirname(working_dir_abs), working_dir_abs)
+
+
+def test_is_within_directory_root_working_directory():
+    root = os.path.abspath(os.sep)
+    assert is_within_directory(os.path.join(root, "etc"), root)
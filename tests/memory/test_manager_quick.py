@@ -55,15 +55,50 @@ def test_user_management():
             manager.set_current_user(user)
             assert manager.current_user.id == user.id
             
+            # Repeat lookups are cached, and updates invalidate the cache
+            assert manager.get_or_create_user("Nick") is same_user
+            manager.add_user_tag("python")
+            assert "python" in manager.get_or_create_user("Nick").tags
+            
             # Test lazy loading of default user
             manager2 = MemoryManager.initialize(config=config)
             default_user = manager2.current_user
             assert default_user.name == config.default_user_id
             manager2.close()
+            
+            # Later managers reuse the resolved default user
+            with MemoryManager.initialize(config=config) as manager3:
+                assert manager3.current_user is default_user
         
         print("✅ User management: PASSED")
 
 
+def test_default_user_relative_path():
+    """A recreated database with a relative or unset path gets a fresh default user."""
+    print("\n🧪 Testing default user with a relative storage path...")
+    
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            # An unset path falls back to memory.db in the working directory
+            for storage_path, filename in (("relative.db", "relative.db"), (None, "memory.db")):
+                config = MemoryConfig(storage_path="relative.db")
+                config.storage_path = storage_path
+                with MemoryManager.initialize(config=config) as manager:
+                    first = manager.current_user
+                
+                os.remove(filename)
+                with MemoryManager.initialize(config=config) as manager:
+                    second = manager.current_user
+                    assert second is not first
+                    assert manager.store.get_user(second.id) is not None
+        finally:
+            os.chdir(cwd)
+    
+    print("✅ Default user with relative path: PASSED")
+
+
 def test_project_management():
     """Test project creation and retrieval."""
     print("\n🧪 Testing project management...")
@@ -151,6 +186,158 @@ def test_conversation_flow():
     print("✅ Conversation flow: PASSED")
 
 
+def test_shared_store_connection():
+    """Managers for the same database share one store until the last closes."""
+    print("\n🧪 Testing shared store connection...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "test.db")
+        config = MemoryConfig(storage_path=db_path)
+        
+        manager1 = MemoryManager.initialize(config=config)
+        manager2 = MemoryManager.initialize(config=config)
+        assert manager1.store is manager2.store
+        
+        # Closing one manager must not break the other
+        manager1.close()
+        manager2.store_conversation("Still open?", "Yes")
+        assert manager2.store.count() == 1
+        
+        manager2.close()
+        assert manager2.store._conn is None
+        
+        # A fresh manager reconnects
+        with MemoryManager.initialize(config=config) as manager3:
+            assert manager3.store.count() == 1
+    
+    print("✅ Shared store connection: PASSED")
+
+
+def test_store_tool_patterns_bulk():
+    """Bulk tool patterns are stored together and retrievable."""
+    print("\n🧪 Testing bulk tool patterns...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "test.db")
+        config = MemoryConfig(storage_path=db_path)
+        
+        with MemoryManager.initialize(config=config) as manager:
+            stored = manager.store_tool_patterns_bulk([
+                ("get_file_content", "get_file_content({'file_path': 'a.py'})", True, 0.5),
+                ("write_file", "write_file({'file_path': '/etc/x'})", False, 0.1),
+            ])
+            
+            assert len(stored) == 2
+            assert stored[1].content.endswith("Result: Failure")
+            assert all(m.scope == MemoryScope.GLOBAL for m in stored)
+            assert stored[0].created_at == stored[1].created_at
+            assert len(manager.get_tool_patterns(limit=10)) == 2
+    
+    print("✅ Bulk tool patterns: PASSED")
+
+
+def test_store_conversations_bulk():
+    """Bulk conversations are stored in one write and keep their order."""
+    print("\n🧪 Testing bulk conversations...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "test.db")
+        config = MemoryConfig(storage_path=db_path)
+        
+        with MemoryManager.initialize(config=config, user_name="Bulk") as manager:
+            stored = manager.store_conversations_bulk([
+                ("first question", "first answer"),
+                ("second question", "second answer"),
+            ])
+            
+            assert len(stored) == 2
+            assert stored[0].content == "User: first question\nAssistant: first answer"
+            assert stored[0].created_at <= stored[1].created_at
+            assert manager.store.count() == 2
+    
+    print("✅ Bulk conversations: PASSED")
+
+
+def test_context_string_cache():
+    """Context is reused between writes and rebuilt after a write."""
+    print("\n🧪 Testing context string cache...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "test.db")
+        config = MemoryConfig(storage_path=db_path)
+        
+        with MemoryManager.initialize(config=config) as manager:
+            manager.store_user_preference("Always use type hints")
+            first = manager.build_context_string()
+            assert "Always use type hints" in first
+            
+            # No writes in between: the cached string is returned
+            assert manager.build_context_string() is first
+            
+            # Different arguments are not served from the cache
+            assert manager.build_context_string(include_preferences=False) != first
+            
+            manager.store_conversation("Hi", "Hello there")
+            rebuilt = manager.build_context_string()
+            assert "Hello there" in rebuilt
+            
+            # Expired entries are rebuilt even without a write
+            config.limits.context_cache_ttl_seconds = 0
+            assert manager.build_context_string() is not rebuilt
+    
+    print("✅ Context string cache: PASSED")
+
+
+def test_write_behind_buffer():
+    """Buffered writes are persisted in batches and visible to reads."""
+    print("\n🧪 Testing write-behind buffer...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "test.db")
+        config = MemoryConfig(storage_path=db_path)
+        config.limits.write_batch_size = 3
+        config.limits.write_flush_interval_ms = 60_000
+        
+        with MemoryManager.initialize(config=config) as manager:
+            manager.store_conversation("one", "1")
+            manager.store_conversation("two", "2")
+            assert manager.store.count() == 0
+            
+            # Reaching the batch size writes everything pending
+            manager.store_conversation("three", "3")
+            assert manager.store.count() == 3
+            
+            # Reads flush first
+            manager.store_user_preference("Prefers tabs")
+            assert "Prefers tabs" in manager.build_context_string()
+            
+            manager.store_conversation("four", "4")
+        
+        # Closing flushes the rest
+        with MemoryManager.initialize(config=config) as manager:
+            assert manager.store.count() == 5
+            
+            # Tool patterns queue behind earlier writes
+            manager.store_conversation("five", "5")
+            manager.store_tool_pattern("grep", "search first")
+            assert manager.store.count() == 5
+            manager.store_conversation("six", "6")
+            assert manager.store.count() == 8
+        
+        # The first queued write arms a timer for the deadline, which
+        # flushes without another write or read; run its callback directly
+        with MemoryManager.initialize(config=config) as manager:
+            manager.store_conversation("seven", "7")
+            timer = manager._flush_timer
+            assert timer is not None and timer.interval == 60
+            assert manager.store.count() == 8
+            timer.function()
+            assert manager.store.count() == 9
+            assert manager._flush_timer is None
+    
+    print("✅ Write-behind buffer: PASSED")
+
+
 if __name__ == "__main__":
     print("🔬 Running MemoryManager Quick Validation Tests")
     print("=" * 60)
@@ -158,8 +345,14 @@ if __name__ == "__main__":
     try:
         test_manager_initialization()
         test_user_management()
+        test_default_user_relative_path()
         test_project_management()
         test_conversation_flow()
+        test_shared_store_connection()
+        test_store_tool_patterns_bulk()
+        test_store_conversations_bulk()
+        test_context_string_cache()
+        test_write_behind_buffer()
         
         print("\n" + "=" * 60)
         print("🎉 All quick validation tests passed!")
@@ -11,6 +11,7 @@ Run with: pytest tests/memory/test_models.py -v
 """
 
 import pytest
+from dataclasses import fields, replace
 from datetime import datetime, timezone, timedelta
 
 from memory.models import Memory, User, Project, MemoryQuery
@@ -78,6 +79,18 @@ class TestUser:
         
         with pytest.raises(AttributeError):
             user.name = "Changed"
+    
+    def test_created_at_iso_is_memoized(self):
+        """created_at_iso should match isoformat() and not leak into copies."""
+        user = User.create("Iso")
+        
+        assert user.created_at_iso == user.created_at.isoformat()
+        assert user.created_at_iso is user.created_at_iso
+        assert user.to_dict()["created_at"] == user.created_at_iso
+        
+        later = replace(user, created_at=datetime(2024, 1, 15, tzinfo=timezone.utc))
+        assert later.created_at_iso == "2024-01-15T00:00:00+00:00"
+        assert later == replace(later)
 
 
 # =============================================================================
@@ -246,6 +259,22 @@ class TestMemory:
                 # Missing project_id!
             )
     
+    def test_unchecked_matches_validated_construction(self):
+        """_unchecked should build the same memory, without validating."""
+        memory = Memory.create(
+            content="Test",
+            memory_type=MemoryType.USER_PREFERENCE,
+            scope=MemoryScope.USER,
+            user_id="usr_123",
+            tags=["a"],
+        )
+        values = [getattr(memory, f.name) for f in fields(Memory)]
+        assert Memory._unchecked(*values) == memory
+        
+        # Stored rows are trusted, so out-of-range values are not rejected
+        values[[f.name for f in fields(Memory)].index("importance")] = 2.0
+        assert Memory._unchecked(*values).importance == 2.0
+    
     def test_global_scope_no_requirements(self):
         """GLOBAL-scoped memories don't require user or project."""
         memory = Memory.create(
@@ -369,6 +398,41 @@ class TestMemory:
         assert restored.metadata == original.metadata
         assert restored.access_count == original.access_count
     
+    def test_from_dict_interns_tags_and_source(self):
+        """Equal tags and sources from separate dicts should share one string."""
+        original = Memory.create(
+            content="Interned",
+            memory_type=MemoryType.CONVERSATION,
+            scope=MemoryScope.USER,
+            user_id="usr_test",
+            tags=["chat"],
+            source="conversation"
+        )
+        # Build the strings at runtime so they start out as distinct objects
+        first = original.to_dict()
+        second = original.to_dict()
+        first["tags"], second["tags"] = ["".join(["ch", "at"])], ["".join(["ch", "at"])]
+        first["source"], second["source"] = "".join(["conver", "sation"]), "".join(["conver", "sation"])
+        
+        a, b = Memory.from_dict(first), Memory.from_dict(second)
+        
+        assert a.tags[0] is b.tags[0]
+        assert a.source is b.source
+    
+    def test_from_dict_null_tags_and_source(self):
+        """Null tags and source should fall back to the defaults."""
+        data = Memory.create(
+            content="Nulls",
+            memory_type=MemoryType.CONVERSATION,
+            scope=MemoryScope.GLOBAL
+        ).to_dict()
+        data["tags"], data["source"] = None, None
+        
+        memory = Memory.from_dict(data)
+        
+        assert memory.tags == []
+        assert memory.source == "unknown"
+    
     def test_repr(self):
         """__repr__ should be readable."""
         memory = Memory.create(
@@ -436,4 +500,23 @@ class TestMemoryQuery:
         )
         
         assert query.created_after == start
-        assert query.created_before == end
\ No newline at end of file
+        assert query.created_before == end
+
+# =============================================================================
+# Layout Tests
+# =============================================================================
+
+@pytest.mark.parametrize("instance", [
+    User.create("Slots"),
+    Project.from_path("/slots/project"),
+    Memory.create(
+        content="Slots",
+        memory_type=MemoryType.CONVERSATION,
+        scope=MemoryScope.USER,
+        user_id="usr_test"
+    ),
+    MemoryQuery(),
+], ids=lambda instance: type(instance).__name__)
+def test_models_are_slotted(instance):
+    """Models should use __slots__ rather than a per-instance __dict__."""
+    assert not hasattr(instance, "__dict__")
@@ -0,0 +1,82 @@
+"""
+Tests for the Response Cache
+
+Run with: pytest tests/memory/test_response_cache.py -v
+"""
+
+import os
+import tempfile
+from datetime import timedelta
+
+from memory.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """Tests for prompt matching, expiry, and eviction."""
+
+    def test_miss_then_hit(self):
+        cache = ResponseCache(ttl=timedelta(days=1))
+        assert cache.get("What is 2 + 2?") is None
+
+        cache.put("What is 2 + 2?", "4")
+        assert cache.get("What is 2 + 2?") == "4"
+
+    def test_prompt_normalization(self):
+        cache = ResponseCache(ttl=timedelta(days=1))
+        cache.put("What is  2 + 2?", "4")
+        assert cache.get("  what is 2 +\t2? ") == "4"
+
+    def test_context_separates_entries(self):
+        cache = ResponseCache(ttl=timedelta(days=1))
+        cache.put("why?", "Because of the cache.", context="The cache is fast.")
+
+        assert cache.get("why?", context="The cache is fast.") == "Because of the cache."
+        assert cache.get("why?", context="The disk is slow.") is None
+        assert cache.get("why?") is None
+
+    def test_expired_entry_is_dropped(self):
+        cache = ResponseCache(ttl=timedelta(seconds=-1))
+        cache.put("hello", "hi")
+        assert cache.get("hello") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ResponseCache(ttl=timedelta(days=1), max_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+
+    def test_clear(self):
+        cache = ResponseCache(ttl=timedelta(days=1))
+        cache.put("a", "1")
+        cache.clear()
+        assert cache.get("a") is None
+
+    def test_entries_persist_across_instances(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "response_cache.json")
+            cache = ResponseCache(ttl=timedelta(days=1), path=path)
+            cache.put("What is 2 + 2?", "4")
+            cache.put("why?", "Arithmetic.", context="4")
+
+            reopened = ResponseCache(ttl=timedelta(days=1), path=path)
+            assert reopened.get("what is 2 + 2?") == "4"
+            assert reopened.get("why?", context="4") == "Arithmetic."
+
+            reopened.clear()
+            assert ResponseCache(ttl=timedelta(days=1), path=path).get("What is 2 + 2?") is None
+
+    def test_expired_and_unreadable_files_load_empty(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "response_cache.json")
+            ResponseCache(ttl=timedelta(days=1), path=path).put("hello", "hi")
+            assert len(ResponseCache(ttl=timedelta(seconds=-1), path=path)) == 0
+
+            with open(path, "w") as f:
+                f.write("not json")
+            assert len(ResponseCache(ttl=timedelta(days=1), path=path)) == 0
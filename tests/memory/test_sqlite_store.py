@@ -19,7 +19,9 @@ from pathlib import Path
 
 from memory.stores.sqlite import SQLiteMemoryStore
 from memory.config import MemoryConfig, MemoryType, MemoryScope, RetentionPolicy
-from memory.models import Memory, User, Project, MemoryQuery
+from memory.models import (
+    Memory, User, Project, MemoryQuery, hash_project_path, legacy_project_path_hash,
+)
 from memory.stores.base import MemoryStoreError, MemoryNotFoundError
 
 
@@ -35,11 +37,12 @@ def temp_db():
     
     yield db_path
     
-    # Cleanup
-    try:
-        os.unlink(db_path)
-    except FileNotFoundError:
-        pass
+    # Cleanup (including WAL side files)
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(db_path + suffix)
+        except FileNotFoundError:
+            pass
 
 
 @pytest.fixture
@@ -104,20 +107,75 @@ class TestDatabaseInitialization:
         
         store.close()
     
+    def test_store_accepts_path_object(self, config, temp_db):
+        """A pathlib.Path db_path should be normalized to a str."""
+        store = SQLiteMemoryStore(config, Path(temp_db))
+        store.initialize()
+        
+        assert store.db_path == temp_db
+        assert store.count() == 0
+        
+        store.close()
+    
     def test_foreign_keys_enabled(self, store):
         """Foreign key constraints should be enabled."""
         result = store.conn.execute("PRAGMA foreign_keys").fetchone()
         assert result[0] == 1  # 1 means enabled
     
+    def test_connection_pragmas_applied(self, store):
+        """Connection tuning from the config should be applied."""
+        assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert store.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert store.conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+        assert store.conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert store.conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0] == 1000
+    
+    def test_invalid_journal_mode_rejected(self, temp_db):
+        """Unknown PRAGMA modes should raise instead of reaching SQL."""
+        store = SQLiteMemoryStore(MemoryConfig(sqlite_journal_mode="WAL; DROP TABLE users"), temp_db)
+        
+        with pytest.raises(ValueError, match="sqlite_journal_mode"):
+            store.initialize()
+        store.close()
+
+    def test_read_pool_sees_committed_writes(self, store, sample_user):
+        """Pooled read connections should be read-only and see the writer's commits."""
+        assert store._readers.qsize() == store.config.sqlite_pool_size
+
+        store.store_user(sample_user)
+        with store._read_conn() as reader:
+            assert reader is not store.conn
+            assert reader.execute("PRAGMA query_only").fetchone()[0] == 1
+        assert store.get_user(sample_user.id) is not None
+
+        store.close()
+        assert store._readers is None
+
     def test_indexes_created(self, store):
         """Important indexes should be created for performance."""
         result = store.conn.execute("SELECT name FROM sqlite_master WHERE type='index'").fetchall()
         index_names = [row[0] for row in result]
         
-        expected_indexes = ["idx_memories_user", "idx_memories_project", "idx_memories_type"]
+        expected_indexes = [
+            "idx_memories_user", "idx_memories_project", "idx_memories_type",
+            "idx_memories_user_project_type_created", "idx_memories_user_type_created",
+        ]
         for index in expected_indexes:
             assert index in index_names
     
+    def test_same_shape_queries_share_sql(self, store):
+        """Queries differing only in values (including limit) should reuse one SQL string."""
+        sql_a, params_a = store._build_select(
+            MemoryQuery(user_id="usr_a", memory_types=[MemoryType.CONVERSATION], limit=5)
+        )
+        sql_b, params_b = store._build_select(
+            MemoryQuery(user_id="usr_b", memory_types=[MemoryType.TASK_RESULT], limit=50)
+        )
+        
+        assert sql_a is sql_b
+        assert params_a[0] == "usr_a" and params_a[-1] == 5
+        assert params_b[0] == "usr_b" and params_b[-1] == 50
+    
     def test_connection_property_fails_when_not_initialized(self, config, temp_db):
         """Accessing conn property should fail if not initialized."""
         store = SQLiteMemoryStore(config, temp_db)
@@ -159,6 +217,20 @@ class TestUserOperations:
         retrieved = store.get_user(user1.id)
         assert retrieved.name == "Updated Name"
     
+    def test_transaction_commits_or_rolls_back_together(self, store, sample_project):
+        """Writes in a transaction() block should commit together, or not at all."""
+        with store.transaction():
+            user = store.upsert_user_by_name("Tx User")
+            store.upsert_project_by_path_hash(sample_project)
+        assert store.get_user(user.id) is not None
+        assert store.get_project(sample_project.id) is not None
+        
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.store_user(User.create("Rolled Back"))
+                raise RuntimeError("abort")
+        assert store.get_user_by_name("Rolled Back") is None
+    
     def test_get_user_by_id_success(self, store, sample_user):
         """Should retrieve user by ID."""
         store.store_user(sample_user)
@@ -199,6 +271,14 @@ class TestUserOperations:
         
         assert retrieved.created_at == original_time
         assert isinstance(retrieved.created_at, datetime)
+    
+    def test_upsert_user_by_name_is_idempotent(self, store):
+        """Upserting the same name twice should return the same stored user."""
+        first = store.upsert_user_by_name("Upsert User")
+        second = store.upsert_user_by_name("Upsert User")
+        
+        assert first.id == second.id
+        assert store.get_user_by_name("Upsert User").id == first.id
 
 
 # =============================================================================
@@ -247,6 +327,24 @@ class TestProjectOperations:
         result = store.get_project_by_path("/nonexistent/path")
         assert result is None
     
+    def test_get_user_and_project(self, store, sample_user, sample_project):
+        """Should find both in one lookup, with None for missing ones."""
+        store.store_user(sample_user)
+        store.store_project(sample_project)
+        
+        user, project = store.get_user_and_project(
+            sample_user.name, sample_project.last_known_path
+        )
+        assert user.id == sample_user.id
+        assert project.id == sample_project.id
+        
+        user, project = store.get_user_and_project("nobody", None)
+        assert user is None and project is None
+        
+        user, project = store.get_user_and_project(None, sample_project.last_known_path)
+        assert user is None
+        assert project.id == sample_project.id
+    
     def test_project_path_hash_consistency(self, store):
         """Same path should always produce same hash."""
         path = "/consistent/test/path"
@@ -259,6 +357,27 @@ class TestProjectOperations:
         
         assert retrieved.path_hash == project1.path_hash
         assert retrieved.path_hash == project2.path_hash
+    
+    def test_legacy_sha256_project_is_found_and_rehashed(self, store):
+        """Projects stored under the old SHA256 path hash should keep their id."""
+        path = "/legacy/project"
+        legacy = Project.from_path(path, hasher=legacy_project_path_hash)
+        store.store_project(legacy)
+        
+        assert store.get_project_by_path(path).id == legacy.id
+        
+        result = store.upsert_project_by_path_hash(Project.from_path(path))
+        assert result.id == legacy.id
+        assert result.path_hash == hash_project_path(path)
+    
+    def test_upsert_project_returns_existing(self, store, sample_project):
+        """Upserting a project whose path is already stored should return the stored row."""
+        store.store_project(sample_project)
+        
+        result = store.upsert_project_by_path_hash(Project.from_path(sample_project.last_known_path))
+        
+        assert result.id == sample_project.id
+        assert result.created_at == sample_project.created_at
 
 
 # =============================================================================
@@ -312,6 +431,26 @@ class TestMemoryOperations:
         result = store.get("mem_nonexistent123")
         assert result is None
     
+    def test_get_memory_round_trips_every_field(self, store, sample_user, sample_project):
+        """Decoded rows should equal the stored memory field for field."""
+        store.store_user(sample_user)
+        store.store_project(sample_project)
+        memory = Memory.create(
+            content="Round trip",
+            memory_type=MemoryType.TOOL_PATTERN,
+            scope=MemoryScope.PROJECT,
+            user_id=sample_user.id,
+            project_id=sample_project.id,
+            importance=0.9,
+            tags=["a", "b"],
+            source="tool",
+            metadata={"k": 1},
+        )
+        memory.mark_accessed()
+        store.store(memory)
+        
+        assert store.get(memory.id) == memory
+    
     def test_memory_json_fields_serialization(self, store, sample_user):
         """Tags and metadata should be properly serialized."""
         store.store_user(sample_user)
@@ -595,6 +734,18 @@ class TestQueryOperations:
         
         assert len(results) == 1
         assert results[0].id == target_memory.id
+    
+    def test_query_without_metadata(self, store, sample_user, sample_memory):
+        """include_metadata=False should skip metadata but keep the other fields."""
+        store.store_user(sample_user)
+        store.store(sample_memory)
+        
+        results = store.query(MemoryQuery(user_id=sample_user.id, include_metadata=False))
+        
+        assert len(results) == 1
+        assert results[0].content == sample_memory.content
+        assert results[0].tags == sample_memory.tags
+        assert results[0].metadata == {}
 
 
 # =============================================================================
@@ -725,6 +876,88 @@ class TestBulkOperations:
         deleted_count = store.clear()
         assert deleted_count == 5
         assert store.count() == 0
+    
+    def test_store_many_persists_all(self, store, sample_user):
+        """store_many() should persist every memory in one call."""
+        store.store_user(sample_user)
+        
+        memories = [
+            Memory.create(
+                content=f"Batched {i}",
+                memory_type=MemoryType.TOOL_PATTERN,
+                scope=MemoryScope.GLOBAL,
+                user_id=sample_user.id
+            )
+            for i in range(4)
+        ]
+        
+        stored = store.store_many(memories)
+        
+        assert [m.id for m in stored] == [m.id for m in memories]
+        assert store.count() == 4
+        assert store.get(memories[2].id).content == "Batched 2"
+    
+    def test_store_many_empty(self, store):
+        """store_many() with no memories should be a no-op."""
+        assert store.store_many([]) == []
+        assert store.count() == 0
+    
+    def test_query_many_matches_individual_queries(self, store, sample_user):
+        """query_many() should return the same results as separate query() calls."""
+        store.store_user(sample_user)
+        
+        base_time = datetime.now(timezone.utc)
+        for i, memory_type in enumerate([MemoryType.CONVERSATION, MemoryType.USER_PREFERENCE] * 3):
+            memory = Memory.create(
+                content=f"Memory {i}",
+                memory_type=memory_type,
+                scope=MemoryScope.USER,
+                user_id=sample_user.id
+            )
+            memory.created_at = base_time - timedelta(minutes=i)
+            store.store(memory)
+        
+        queries = [
+            MemoryQuery(user_id=sample_user.id, memory_types=[MemoryType.CONVERSATION], limit=2),
+            MemoryQuery(user_id=sample_user.id, memory_types=[MemoryType.USER_PREFERENCE]),
+            MemoryQuery(memory_types=[MemoryType.TOOL_PATTERN]),
+        ]
+        
+        combined = store.query_many(queries)
+        
+        assert [[m.id for m in r] for r in combined] == [
+            [m.id for m in store.query(q)] for q in queries
+        ]
+        assert [len(r) for r in combined] == [2, 3, 0]
+    
+    @pytest.mark.parametrize("order_desc", [False, True])
+    def test_query_many_orders_nullable_column(self, store, sample_user, order_desc):
+        """Ordering by a nullable column should match SQLite's NULL placement."""
+        store.store_user(sample_user)
+        
+        base_time = datetime.now(timezone.utc)
+        for i in range(4):
+            memory = Memory.create(
+                content=f"Memory {i}",
+                memory_type=MemoryType.CONVERSATION,
+                scope=MemoryScope.USER,
+                user_id=sample_user.id
+            )
+            # Half the memories were never accessed
+            if i % 2:
+                memory.last_accessed_at = base_time - timedelta(minutes=i)
+            store.store(memory)
+        
+        queries = [
+            MemoryQuery(user_id=sample_user.id, order_by="last_accessed_at", order_desc=order_desc),
+            MemoryQuery(user_id=sample_user.id),
+        ]
+        
+        combined = store.query_many(queries)
+        
+        expected = [m.last_accessed_at for m in store.query(queries[0])]
+        assert [m.last_accessed_at for m in combined[0]] == expected
+        assert (expected[0] is None) != order_desc
 
 
 # =============================================================================
@@ -855,6 +1088,21 @@ class TestErrorHandling:
         memory3 = store.get(sample_memory.id)
         assert memory3.access_count == 1
     
+    def test_null_tags_and_source_columns(self, store, sample_user, sample_memory):
+        """Rows with NULL source or JSON null tags should still load."""
+        store.store_user(sample_user)
+        store.store(sample_memory)
+        with store._write_conn() as conn:
+            conn.execute(
+                "UPDATE memories SET source = NULL, tags = 'null' WHERE id = ?",
+                (sample_memory.id,)
+            )
+        
+        memory = store.get(sample_memory.id)
+        
+        assert memory.tags == []
+        assert memory.source == "unknown"
+    
     def test_get_and_track_nonexistent_memory(self, store):
         """get_and_track should return None for non-existent memory."""
         result = store.get_and_track("mem_nonexistent")